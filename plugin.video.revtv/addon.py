@@ -10,6 +10,7 @@ Users must provide their own credentials. Not affiliated with any streaming serv
 """
 
 import sys
+import time
 import xbmc
 import xbmcgui
 import xbmcplugin
@@ -17,16 +18,14 @@ import xbmcaddon
 
 from urllib.parse import urlencode, parse_qsl
 
-# Addon info
-ADDON = xbmcaddon.Addon()
-ADDON_ID = ADDON.getAddonInfo('id')
-ADDON_NAME = ADDON.getAddonInfo('name')
-ADDON_VERSION = ADDON.getAddonInfo('version')
-ADDON_PATH = ADDON.getAddonInfo('path')
-ADDON_ICON = ADDON.getAddonInfo('icon')
-
-# Plugin handle
-HANDLE = int(sys.argv[1])
+# Addon info (static, so safe to keep when the language invoker is reused;
+# the plugin handle and parameters are read per call in main())
+_ADDON = xbmcaddon.Addon()
+ADDON_ID = _ADDON.getAddonInfo('id')
+ADDON_NAME = _ADDON.getAddonInfo('name')
+ADDON_VERSION = _ADDON.getAddonInfo('version')
+ADDON_PATH = _ADDON.getAddonInfo('path')
+ADDON_ICON = _ADDON.getAddonInfo('icon')
 
 
 def get_url(**kwargs):
@@ -44,12 +43,12 @@ def show_notification(message, heading=ADDON_NAME, icon=ADDON_ICON, time=5000):
     xbmcgui.Dialog().notification(heading, message, icon, time)
 
 
-def show_main_menu():
+def show_main_menu(handle):
     """Display the main menu with available services."""
     log("Showing main menu")
     
-    xbmcplugin.setPluginCategory(HANDLE, ADDON_NAME)
-    xbmcplugin.setContent(HANDLE, 'files')
+    xbmcplugin.setPluginCategory(handle, ADDON_NAME)
+    xbmcplugin.setContent(handle, 'files')
     
     services = [
         {'name': '📺 JioTV', 'action': 'jiotv', 'enabled': True, 'desc': '800+ Live TV Channels'},
@@ -72,22 +71,22 @@ def show_main_menu():
         
         if service['enabled']:
             url = get_url(action=service['action'])
-            xbmcplugin.addDirectoryItem(HANDLE, url, list_item, isFolder=True)
+            xbmcplugin.addDirectoryItem(handle, url, list_item, isFolder=True)
         else:
             url = get_url(action='coming_soon', service=service['name'])
-            xbmcplugin.addDirectoryItem(HANDLE, url, list_item, isFolder=False)
+            xbmcplugin.addDirectoryItem(handle, url, list_item, isFolder=False)
     
     # Separator
     sep = xbmcgui.ListItem(label='─' * 40)
     sep.setProperty('IsPlayable', 'false')
-    xbmcplugin.addDirectoryItem(HANDLE, '', sep, isFolder=False)
+    xbmcplugin.addDirectoryItem(handle, '', sep, isFolder=False)
     
     # Settings
     settings_item = xbmcgui.ListItem(label='⚙️ Settings')
     settings_item.setArt({'icon': ADDON_ICON})
-    xbmcplugin.addDirectoryItem(HANDLE, get_url(action='settings'), settings_item, isFolder=False)
+    xbmcplugin.addDirectoryItem(handle, get_url(action='settings'), settings_item, isFolder=False)
     
-    xbmcplugin.endOfDirectory(HANDLE)
+    xbmcplugin.endOfDirectory(handle)
 
 
 def show_coming_soon(service_name='This service'):
@@ -97,37 +96,42 @@ def show_coming_soon(service_name='This service'):
 
 def open_settings():
     """Open addon settings."""
-    ADDON.openSettings()
+    xbmcaddon.Addon().openSettings()
 
 
-def router(params):
+def router(params, handle):
     """Route to the appropriate action based on parameters."""
     action = params.get('action')
     
     log(f"Router action: {action}, params: {params}")
     
     if action is None:
-        show_main_menu()
+        show_main_menu(handle)
     
     # JioTV routes
     elif action == 'jiotv':
         from lib.services import jiotv
-        jiotv.show_menu(HANDLE, get_url)
+        jiotv.show_menu(handle, get_url)
     elif action == 'jiotv_categories':
         from lib.services import jiotv
-        jiotv.show_categories(HANDLE, get_url)
+        jiotv.show_categories(handle, get_url)
     elif action == 'jiotv_languages':
         from lib.services import jiotv
-        jiotv.show_languages(HANDLE, get_url)
+        jiotv.show_languages(handle, get_url)
     elif action == 'jiotv_channels':
         from lib.services import jiotv
         category = params.get('category')
         language = params.get('language')
-        jiotv.show_channels(HANDLE, get_url, category=category, language=language)
+        jiotv.show_channels(handle, get_url, category=category, language=language)
+    elif action == 'jiotv_now_next':
+        from lib.services import jiotv
+        category = params.get('category')
+        language = params.get('language')
+        jiotv.show_now_next(handle, get_url, category=category, language=language)
     elif action == 'jiotv_play':
         from lib.services import jiotv
         channel_id = params.get('channel_id')
-        jiotv.play_channel(HANDLE, channel_id)
+        jiotv.play_channel(handle, channel_id)
     elif action == 'jiotv_login':
         from lib.services import jiotv
         jiotv.login()
@@ -147,14 +151,17 @@ def router(params):
     
     else:
         log(f"Unknown action: {action}", xbmc.LOGWARNING)
-        show_main_menu()
+        show_main_menu(handle)
 
 
 def main():
-    """Main entry point."""
+    """Main entry point; runs once per plugin call, even in a reused interpreter."""
+    start = time.monotonic()
     log(f"RevTV {ADDON_VERSION} started")
+    handle = int(sys.argv[1])
     params = dict(parse_qsl(sys.argv[2][1:]))
-    router(params)
+    router(params, handle)
+    log(f"Handled {params.get('action', 'main_menu')} in {(time.monotonic() - start) * 1000:.0f} ms")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+"""Household Gateway Package"""
+from lib.gateway.server import GatewayServer
+from lib.gateway.client import GatewayClient
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Household Gateway Client for RevTV
+
+Fetches channel, EPG and playback data from another RevTV install running
+in gateway server mode. Every method returns None when the gateway cannot
+answer, so callers fall back to talking to JioTV directly. A gateway
+that cannot be reached is skipped for DOWN_SECONDS, so a powered-off
+gateway costs one failed connection rather than one per call.
+"""
+import time
+
+import requests
+import xbmc
+
+from lib.gateway.server import DEFAULT_PORT, KEY_HEADER
+from lib.utils.http import get_session
+
+DOWN_SECONDS = 60
+
+# Gateway base URL -> time until which it is treated as down (per process)
+_down_until = {}
+
+
+def log(message, level=xbmc.LOGINFO):
+    """Log message to Kodi log."""
+    xbmc.log(f"[RevTV:Gateway] {message}", level)
+
+
+class GatewayClient:
+    """Thin HTTP client for the household gateway API."""
+
+    def __init__(self, host, key, port=DEFAULT_PORT, timeout=3):
+        self.base_url = f"http://{host}:{port}"
+        self.timeout = timeout
+        self.headers = {KEY_HEADER: key}
+        self.session = get_session(retry=False)
+
+    @classmethod
+    def from_settings(cls, addon):
+        """Build a client from addon settings, or None if client mode is off."""
+        if addon.getSetting('gateway_mode') != 'client':
+            return None
+        host = addon.getSetting('gateway_host')
+        key = addon.getSetting('gateway_key')
+        if not host or not key:
+            log("Client mode enabled but host or key missing", xbmc.LOGWARNING)
+            return None
+        port = int(addon.getSetting('gateway_port') or DEFAULT_PORT)
+        return cls(host, key, port=port)
+
+    def is_down(self):
+        """True while a recent connection failure says the gateway is unreachable."""
+        return _down_until.get(self.base_url, 0) > time.time()
+
+    def _get(self, path, timeout=None, **params):
+        if self.is_down():
+            return None
+        try:
+            resp = self.session.get(
+                f"{self.base_url}{path}", params=params, headers=self.headers,
+                timeout=min(timeout, self.timeout) if timeout else self.timeout
+            )
+            if resp.status_code == 200:
+                return resp.json().get('result')
+            log(f"GET {path} failed: {resp.status_code}", xbmc.LOGWARNING)
+        except requests.ConnectionError as e:
+            _down_until[self.base_url] = time.time() + DOWN_SECONDS
+            log(f"GET {path} error, skipping gateway for {DOWN_SECONDS}s: {e}", xbmc.LOGWARNING)
+        except Exception as e:
+            log(f"GET {path} error: {e}", xbmc.LOGWARNING)
+        return None
+
+    def get_channels(self):
+        return self._get('/channels')
+
+    def get_epg(self, channel_id, offset=0, timeout=None):
+        return self._get('/epg', timeout=timeout, channel_id=channel_id, offset=offset)
+
+    def get_playback_url(self, channel_id):
+        return self._get('/play', channel_id=channel_id)
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+Household Gateway Server for RevTV
+
+Runs inside the RevTV service on one Kodi box and shares its resolved
+JioTV data with other RevTV installs on the LAN, so the household only
+downloads the catalogue and refreshes tokens once.
+
+Endpoints (all require the X-RevTV-Key header):
+- GET /channels                          -> full channel list
+- GET /epg?channel_id=<id>&offset=<n>    -> EPG for one channel/day
+- GET /play?channel_id=<id>              -> resolved playback URL
+"""
+import hmac
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qsl
+
+import xbmc
+
+DEFAULT_PORT = 48080
+KEY_HEADER = 'X-RevTV-Key'
+
+# Seconds each kind of upstream result is served from the gateway cache
+CACHE_TTL = {
+    'channels': 3600,
+    'epg': 1800,
+    'play': 120,
+}
+
+
+def log(message, level=xbmc.LOGINFO):
+    """Log message to Kodi log."""
+    xbmc.log(f"[RevTV:Gateway] {message}", level)
+
+
+class _TTLCache:
+    """Minimal thread-safe cache with per-entry expiry."""
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry and entry[0] > time.time():
+                return entry[1]
+            self._data.pop(key, None)
+            return None
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._data[key] = (time.time() + ttl, value)
+
+
+class _GatewayHandler(BaseHTTPRequestHandler):
+    """Request handler; the owning GatewayServer is self.server.gateway."""
+
+    def do_GET(self):
+        gateway = self.server.gateway
+        supplied = self.headers.get(KEY_HEADER, '')
+        if not hmac.compare_digest(supplied.encode(), gateway.key.encode()):
+            self._send(401, {'error': 'unauthorized'})
+            return
+
+        parsed = urlparse(self.path)
+        params = dict(parse_qsl(parsed.query))
+        route = parsed.path.strip('/')
+
+        try:
+            if route == 'channels':
+                result = gateway.channels()
+            elif route == 'epg' and params.get('channel_id'):
+                result = gateway.epg(params['channel_id'], int(params.get('offset', 0)))
+            elif route == 'play' and params.get('channel_id'):
+                result = gateway.playback_url(params['channel_id'])
+            else:
+                self._send(404, {'error': 'not found'})
+                return
+        except Exception as e:
+            log(f"{route} error: {e}", xbmc.LOGERROR)
+            result = None
+
+        # An empty guide is a valid answer; an empty channel list or URL is not
+        if result is None or (not result and route != 'epg'):
+            self._send(502, {'error': 'upstream unavailable'})
+        else:
+            self._send(200, {'result': result})
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        log(format % args, xbmc.LOGDEBUG)
+
+
+class GatewayServer:
+    """Serves cached channel, EPG and playback data from a JioTVAPI instance.
+
+    get_api is called for every upstream fetch, so credentials refreshed or
+    changed after the server started are used without restarting it.
+    """
+
+    def __init__(self, get_api, key, port=DEFAULT_PORT, host='0.0.0.0'):
+        if not key:
+            raise ValueError('A gateway key is required')
+        self.get_api = get_api
+        self.key = key
+        self.address = (host, port)
+        self._cache = _TTLCache()
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def port(self):
+        """Port actually bound (useful when started with port 0)."""
+        return self._httpd.server_address[1] if self._httpd else self.address[1]
+
+    def start(self):
+        """Start serving on a background thread."""
+        self._httpd = ThreadingHTTPServer(self.address, _GatewayHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.gateway = self
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        log(f"Listening on {self.address[0]}:{self.port}")
+
+    def stop(self):
+        """Stop serving and release the socket."""
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+            log("Stopped")
+
+    def _cached(self, key, ttl, fetch):
+        value = self._cache.get(key)
+        if value is None:
+            value = fetch()
+            if value:
+                self._cache.set(key, value, ttl)
+        return value
+
+    def channels(self):
+        return self._cached('channels', CACHE_TTL['channels'], lambda: self.get_api().get_all_channels())
+
+    def epg(self, channel_id, offset=0):
+        return self._cached(
+            ('epg', channel_id, offset), CACHE_TTL['epg'],
+            lambda: self.get_api().get_epg(channel_id, offset)
+        )
+
+    def playback_url(self, channel_id):
+        return self._cached(
+            ('play', channel_id), CACHE_TTL['play'],
+            lambda: self.get_api().get_playback_url(channel_id)
+        )
@@ -1,3 +1,4 @@
 # -*- coding: utf-8 -*-
 """RevTV Services Package"""
+from lib.services.base import ServiceProvider
 from lib.services import jiotv, hotstar, sonyliv, zee5, etvwin, sunnxt, aha
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+Service Provider base class for RevTV
+
+Every streaming service builds on ServiceProvider so that all of them share
+one pooled HTTP session, per-host rate limits and the same hooks for
+authentication, in-process caching and request metrics.
+
+Copyright (c) 2025 surevs - MIT License
+"""
+import threading
+import time
+from urllib.parse import urlparse
+
+import xbmc
+
+from lib.utils.batch import BatchEngine, MAX_CONCURRENCY
+from lib.utils.http import get_session, get_rate_limiter
+
+_metrics = {}
+_metrics_lock = threading.Lock()
+
+
+def get_metrics():
+    """Return a copy of {host: {'requests', 'errors', 'seconds'}} for this process."""
+    with _metrics_lock:
+        return {host: dict(m) for host, m in _metrics.items()}
+
+
+class ServiceProvider:
+    """Base class for service API clients.
+
+    Subclasses set `name`, `base_headers` and `rate_limits`
+    ({host: (requests_per_second, burst)}) and override the hooks below.
+    """
+
+    name = 'service'
+    base_headers = {}
+    rate_limits = {}
+    timeout = 30
+
+    def __init__(self):
+        self.session = get_session()
+        self.limiter = get_rate_limiter()
+        for host, (rate, burst) in self.rate_limits.items():
+            self.limiter.set_limit(host, rate, burst)
+        self._cache = {}
+        self._cache_lock = threading.Lock()
+
+    # Hooks
+
+    def auth_headers(self):
+        """Headers identifying the logged-in user; empty when logged out."""
+        return {}
+
+    def refresh_auth(self):
+        """Renew credentials after a 401. Return True if the request should be retried."""
+        return False
+
+    def on_response(self, url, response, elapsed):
+        """Record per-host metrics. `response` is None when the request raised."""
+        host = urlparse(url).netloc
+        with _metrics_lock:
+            m = _metrics.setdefault(host, {'requests': 0, 'errors': 0, 'seconds': 0.0})
+            m['requests'] += 1
+            m['seconds'] += elapsed
+            if response is None or response.status_code >= 400:
+                m['errors'] += 1
+
+    # Requests
+
+    def request(self, method, url, headers=None, auth=True, retry_auth=True, **kwargs):
+        """Send a rate-limited request on the shared session.
+
+        `headers` replaces `base_headers` when given; auth headers are added
+        on top unless `auth` is False. A 401 triggers `refresh_auth` and one
+        retry unless `retry_auth` is False.
+        """
+        merged = dict(self.base_headers if headers is None else headers)
+        if auth:
+            merged.update(self.auth_headers())
+        kwargs.setdefault('timeout', self.timeout)
+
+        self.limiter.acquire(url)
+        start = time.monotonic()
+        try:
+            resp = self.session.request(method, url, headers=merged, **kwargs)
+        except Exception as e:
+            self._notify_response(url, None, time.monotonic() - start)
+            xbmc.log(f"[RevTV:{self.name}] {method} error: {e}", xbmc.LOGERROR)
+            raise
+        self._notify_response(url, resp, time.monotonic() - start)
+
+        if resp.status_code == 401 and auth and retry_auth and self.refresh_auth():
+            return self.request(method, url, headers=headers, auth=auth, retry_auth=False, **kwargs)
+        return resp
+
+    def _notify_response(self, url, response, elapsed):
+        """Run the on_response hook; a failing hook never fails the request."""
+        try:
+            self.on_response(url, response, elapsed)
+        except Exception as e:
+            xbmc.log(f"[RevTV:{self.name}] on_response hook error: {e}", xbmc.LOGDEBUG)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def get_many(self, requests, deadline=None, max_workers=MAX_CONCURRENCY, should_stop=None):
+        """GET many URLs concurrently through this provider; see BatchEngine.get_many."""
+        engine = BatchEngine(client=self, max_workers=max_workers, timeout=self.timeout)
+        return engine.get_many(requests, deadline=deadline, should_stop=should_stop)
+
+    # Caching
+
+    def cached(self, key, ttl, fetch):
+        """Return fetch() through an in-process cache; empty results are not kept."""
+        now = time.time()
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry and entry[0] > now:
+                return entry[1]
+        value = fetch()
+        if value:
+            with self._cache_lock:
+                self._cache[key] = (now + ttl, value)
+        return value
+
+    def invalidate(self, key=None):
+        """Drop one cached entry, or everything when key is None."""
+        with self._cache_lock:
+            if key is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(key, None)
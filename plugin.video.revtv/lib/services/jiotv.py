@@ -14,14 +14,23 @@ import xbmc
 import xbmcgui
 import xbmcplugin
 import xbmcaddon
-import requests
+import xbmcvfs
 import json
 import time
 import hashlib
 import base64
+import os
+import threading
+from functools import lru_cache, partial
 from urllib.parse import urlencode
 
-ADDON = xbmcaddon.Addon()
+from lib.gateway import GatewayClient
+from lib.services.base import ServiceProvider
+from lib.utils.batch import BatchEngine
+from lib.utils.epg import EPGStore, LOOKAHEAD_SECONDS
+from lib.utils.health import HealthStore, HealthChecker, Unresolved
+
+PROFILE_PATH = xbmcvfs.translatePath(xbmcaddon.Addon().getAddonInfo('profile'))
 
 # API Endpoints (based on JioTV Go and community research)
 API_ENDPOINTS = {
@@ -43,6 +52,32 @@ BASE_HEADERS = {
     'x-app-version': '1.0.4',
 }
 
+# Per-host request limits (requests/sec, burst); other hosts use the shared default
+RATE_LIMITS = {
+    'api.jio.com': (0.5, 2),
+    'auth.media.jio.com': (0.2, 2),
+    'jiotv.data.cdn.jio.com': (5, 10),
+    'jiotvapi.media.jio.com': (2, 5),
+}
+
+# Settings that change which upstream the API client talks to
+GATEWAY_SETTINGS = ('gateway_mode', 'gateway_host', 'gateway_port', 'gateway_key')
+
+CHANNELS_TTL = 600  # Seconds the channel list is reused in-process
+EPG_FETCH_DEADLINE = 10  # Seconds to wait for missing guides before listing
+EPG_PREWARM_DEADLINE = 120  # Seconds per service pass that refreshes listed guides
+EPG_INCOMPLETE_SECONDS = 60  # How long a Now & Next answer with missing guides is reused
+
+# Headers for manifest/segment requests (Inputstream Adaptive and health probes)
+STREAM_HEADERS = {k: v for k, v in BASE_HEADERS.items() if k not in ('Accept', 'Content-Type')}
+STREAM_HEADERS_STR = '&'.join(f"{k}={v}" for k, v in STREAM_HEADERS.items())
+
+# Quality-based bandwidth limits (bits/sec) for low bandwidth optimization; auto = no limit
+QUALITY_BANDWIDTH = {'low': 500000, 'medium': 1500000, 'high': 5000000}
+
+# Window property read by the service to report time-to-first-frame
+PLAY_START_PROPERTY = 'RevTV.play_start'
+
 # Category mappings
 CATEGORIES = {
     'Entertainment': 5, 'Movies': 6, 'Kids': 7, 'Sports': 8,
@@ -61,52 +96,80 @@ LANG_NAMES = {v: k for k, v in LANGUAGES.items()}
 CAT_NAMES = {v: k for k, v in CATEGORIES.items()}
 
 
-class JioTVAPI:
+class JioTVAPI(ServiceProvider):
     """JioTV API Client with OTP authentication."""
     
+    name = 'JioTV'
+    base_headers = BASE_HEADERS
+    rate_limits = RATE_LIMITS
+    
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update(BASE_HEADERS)
+        super().__init__()
+        addon = get_addon()
+        self.gateway_settings = tuple(addon.getSetting(k) for k in GATEWAY_SETTINGS)
+        self.gateway = GatewayClient.from_settings(addon)
         self._load_credentials()
     
     def _load_credentials(self):
         """Load stored credentials from addon settings."""
-        self.access_token = ADDON.getSetting('jiotv_token') or ''
-        self.refresh_token = ADDON.getSetting('jiotv_refresh_token') or ''
-        self.subscriber_id = ADDON.getSetting('jiotv_subscriber_id') or ''
-        self.device_id = ADDON.getSetting('jiotv_device_id') or self._generate_device_id()
+        addon = get_addon()
+        self.access_token = addon.getSetting('jiotv_token') or ''
+        self.refresh_token = addon.getSetting('jiotv_refresh_token') or ''
+        self.subscriber_id = addon.getSetting('jiotv_subscriber_id') or ''
+        self.device_id = addon.getSetting('jiotv_device_id') or self._generate_device_id()
     
     def _generate_device_id(self):
         """Generate a unique device ID."""
         import uuid
         device_id = str(uuid.uuid4())
-        ADDON.setSetting('jiotv_device_id', device_id)
+        get_addon().setSetting('jiotv_device_id', device_id)
         return device_id
     
     def _save_credentials(self, data):
         """Save authentication tokens to addon settings."""
+        addon = get_addon()
         if 'authToken' in data:
-            ADDON.setSetting('jiotv_token', data['authToken'])
+            addon.setSetting('jiotv_token', data['authToken'])
             self.access_token = data['authToken']
         if 'refreshToken' in data:
-            ADDON.setSetting('jiotv_refresh_token', data['refreshToken'])
+            addon.setSetting('jiotv_refresh_token', data['refreshToken'])
             self.refresh_token = data['refreshToken']
         if 'subscriberId' in data:
-            ADDON.setSetting('jiotv_subscriber_id', data['subscriberId'])
+            addon.setSetting('jiotv_subscriber_id', data['subscriberId'])
             self.subscriber_id = data['subscriberId']
     
     def is_logged_in(self):
         """Check if user has valid credentials."""
         return bool(self.access_token)
     
-    def get_auth_headers(self):
+    def has_gateway(self):
+        """Check if a household gateway is configured as the data source."""
+        return self.gateway is not None
+    
+    def auth_headers(self):
         """Get headers with authentication token."""
-        headers = BASE_HEADERS.copy()
-        if self.access_token:
-            headers['Authorization'] = f'Bearer {self.access_token}'
-            headers['subscriberId'] = self.subscriber_id
-            headers['deviceId'] = self.device_id
-        return headers
+        if not self.access_token:
+            return {}
+        return {
+            'Authorization': f'Bearer {self.access_token}',
+            'subscriberId': self.subscriber_id,
+            'deviceId': self.device_id,
+        }
+    
+    def refresh_auth(self):
+        """Refresh expired tokens before a request is retried."""
+        return self.refresh_auth_token()
+    
+    def invalidate(self, key=None):
+        """Drop cached API data and the Now & Next answers derived from it.
+        
+        A full invalidation (login, logout, new token) also forgets channel
+        health, which may have been recorded under the previous account.
+        """
+        super().invalidate(key)
+        _now_next_cache.clear()
+        if key is None:
+            get_health_store().clear()
     
     def send_otp(self, mobile_number):
         """Send OTP to mobile number."""
@@ -115,11 +178,7 @@ class JioTVAPI:
                 'number': f'+91{mobile_number}',
                 'otp_type': 'login'
             }
-            resp = self.session.post(
-                API_ENDPOINTS['send_otp'],
-                json=payload,
-                timeout=30
-            )
+            resp = self.post(API_ENDPOINTS['send_otp'], json=payload, auth=False)
             log(f"Send OTP response: {resp.status_code}")
             return resp.status_code == 200
         except Exception as e:
@@ -141,16 +200,13 @@ class JioTVAPI:
                     }
                 }
             }
-            resp = self.session.post(
-                API_ENDPOINTS['verify_otp'],
-                json=payload,
-                timeout=30
-            )
+            resp = self.post(API_ENDPOINTS['verify_otp'], json=payload, auth=False)
             log(f"Verify OTP response: {resp.status_code}")
             
             if resp.status_code == 200:
                 data = resp.json()
                 self._save_credentials(data)
+                self.invalidate()
                 return True
             return False
         except Exception as e:
@@ -162,14 +218,8 @@ class JioTVAPI:
         if not self.refresh_token:
             return False
         try:
-            headers = self.get_auth_headers()
             payload = {'refreshToken': self.refresh_token}
-            resp = self.session.post(
-                API_ENDPOINTS['refresh_token'],
-                headers=headers,
-                json=payload,
-                timeout=30
-            )
+            resp = self.post(API_ENDPOINTS['refresh_token'], json=payload, retry_auth=False)
             if resp.status_code == 200:
                 data = resp.json()
                 self._save_credentials(data)
@@ -181,61 +231,102 @@ class JioTVAPI:
     
     def get_channels(self, language_id=None, category_id=None):
         """Fetch all channels, optionally filtered."""
+        channels = self.get_all_channels()
+        
+        # Filter by language
+        if language_id:
+            channels = [c for c in channels if c.get('channelLanguageId') == language_id]
+        
+        # Filter by category
+        if category_id:
+            channels = [c for c in channels if c.get('channelCategoryId') == category_id]
+        
+        log(f"Got {len(channels)} channels")
+        return channels
+    
+    def get_all_channels(self):
+        """Fetch the unfiltered channel list, via the gateway when configured."""
+        return self.cached('channels', CHANNELS_TTL, self._fetch_channels) or []
+    
+    def _fetch_channels(self):
+        if self.gateway:
+            channels = self.gateway.get_channels()
+            if channels:
+                return channels
+            log("Gateway unavailable, fetching channels directly")
+        
         try:
-            resp = self.session.get(
-                API_ENDPOINTS['channels'],
-                headers=self.get_auth_headers(),
-                timeout=30
-            )
+            resp = self.get(API_ENDPOINTS['channels'])
             if resp.status_code != 200:
                 log(f"Get channels failed: {resp.status_code}")
                 return []
             
             data = resp.json()
-            channels = data.get('result', [])
-            
-            # Filter by language
-            if language_id:
-                channels = [c for c in channels if c.get('channelLanguageId') == language_id]
-            
-            # Filter by category
-            if category_id:
-                channels = [c for c in channels if c.get('channelCategoryId') == category_id]
-            
-            log(f"Got {len(channels)} channels")
-            return channels
+            return data.get('result', [])
         except Exception as e:
             log(f"Get channels error: {e}", xbmc.LOGERROR)
             return []
     
+    def get_epg(self, channel_id, offset=0, timeout=None):
+        """Fetch programme guide for a channel (offset 0 = today)."""
+        if self.gateway:
+            started = time.monotonic()
+            epg = self.gateway.get_epg(channel_id, offset, timeout=timeout)
+            if epg is not None:
+                return epg
+            log("Gateway unavailable, fetching EPG directly")
+            if timeout:
+                # The direct request only gets what the gateway left of the budget
+                timeout = max(timeout - (time.monotonic() - started), 0.1)
+        
+        try:
+            resp = self.get(
+                API_ENDPOINTS['epg'],
+                params={'offset': offset, 'channel_id': channel_id, 'langId': 6},
+                timeout=timeout or self.timeout
+            )
+            if resp.status_code != 200:
+                log(f"Get EPG failed: {resp.status_code}")
+                return []
+            
+            return resp.json().get('epg', [])
+        except Exception as e:
+            log(f"Get EPG error: {e}", xbmc.LOGERROR)
+            return []
+    
     def get_playback_url(self, channel_id):
-        """Get stream URL for a channel."""
-        if not self.is_logged_in():
+        """Get stream URL for a channel, via the gateway when configured."""
+        if self.gateway:
+            url = self.gateway.get_playback_url(channel_id)
+            if url:
+                return url
+            log("Gateway unavailable, resolving playback directly")
+        
+        return self._resolve_playback_url(channel_id)
+    
+    def _resolve_playback_url(self, channel_id):
+        """Resolve stream URL for a channel against the JioTV API."""
+        if not self.access_token:
             return None
         
         try:
-            headers = self.get_auth_headers()
+            headers = BASE_HEADERS.copy()
             headers['channel_id'] = str(channel_id)
             headers['stream_type'] = 'Seek'
             
             # Quality setting
-            quality = ADDON.getSetting('jiotv_quality') or 'auto'
+            quality = get_addon().getSetting('jiotv_quality') or 'auto'
             quality_map = {'low': 'low', 'medium': 'medium', 'high': 'high', 'auto': 'high'}
             headers['quality'] = quality_map.get(quality, 'high')
             
-            resp = self.session.get(
+            resp = self.get(
                 f"{API_ENDPOINTS['playback']}?channel_id={channel_id}",
-                headers=headers,
-                timeout=30
+                headers=headers
             )
             
             if resp.status_code == 200:
                 data = resp.json()
                 return data.get('result', {}).get('url')
-            elif resp.status_code == 401:
-                # Token expired, try refresh
-                if self.refresh_auth_token():
-                    return self.get_playback_url(channel_id)
             
             log(f"Get playback URL failed: {resp.status_code}")
             return None
@@ -244,8 +335,31 @@ class JioTVAPI:
             return None
 
 
-# Global API instance
-api = JioTVAPI()
+# API client kept for the life of the interpreter, so that with
+# reuselanguageinvoker the session, credentials and channel list
+# survive between plugin calls.
+_api = None
+_api_lock = threading.Lock()
+
+
+def get_api():
+    """Return the shared API client, rebuilt or reloaded when settings changed."""
+    global _api
+    addon = get_addon()
+    with _api_lock:
+        if _api is None or _api.gateway_settings != tuple(addon.getSetting(k) for k in GATEWAY_SETTINGS):
+            _api = JioTVAPI()
+            _now_next_cache.clear()
+        elif _api.access_token != addon.getSetting('jiotv_token'):
+            # Logged in/out or token refreshed by another process (e.g. the service)
+            _api._load_credentials()
+            _api.invalidate()
+        return _api
+
+
+def get_addon():
+    """Return a fresh Addon handle; a long-lived one can serve stale settings."""
+    return xbmcaddon.Addon()
 
 
 def log(message, level=xbmc.LOGINFO):
@@ -255,16 +369,18 @@ def log(message, level=xbmc.LOGINFO):
 
 def show_menu(handle, get_url):
     """Show JioTV main menu."""
+    api = get_api()
     xbmcplugin.setPluginCategory(handle, 'JioTV')
     xbmcplugin.setContent(handle, 'files')
     
     items = []
     
-    if not api.is_logged_in():
+    if not api.is_logged_in() and not api.has_gateway():
         items.append(('🔐 Login with OTP', get_url(action='jiotv_login'), False))
     else:
         items.extend([
             ('📺 Telugu Channels', get_url(action='jiotv_channels', language=11), True),
+            ('🕒 Now & Next (Telugu)', get_url(action='jiotv_now_next', language=11), True),
             ('🎬 Entertainment', get_url(action='jiotv_channels', category=5), True),
             ('🎥 Movies', get_url(action='jiotv_channels', category=6), True),
             ('📰 News', get_url(action='jiotv_channels', category=12), True),
@@ -272,8 +388,12 @@ def show_menu(handle, get_url):
             ('📂 All Categories', get_url(action='jiotv_categories'), True),
             ('🌐 All Languages', get_url(action='jiotv_languages'), True),
             ('📋 All Channels', get_url(action='jiotv_channels'), True),
-            ('🚪 Logout', get_url(action='jiotv_logout'), False),
         ])
+        if api.is_logged_in():
+            items.append(('🚪 Logout', get_url(action='jiotv_logout'), False))
+        else:
+            # Gateway client without its own login; needed if the gateway goes down
+            items.append(('🔐 Login with OTP', get_url(action='jiotv_login'), False))
     
     for label, url, is_folder in items:
         li = xbmcgui.ListItem(label=label)
@@ -304,6 +424,7 @@ def show_languages(handle, get_url):
 
 def show_channels(handle, get_url, category=None, language=None):
     """Show channels list."""
+    api = get_api()
     xbmcplugin.setPluginCategory(handle, 'Channels')
     xbmcplugin.setContent(handle, 'videos')
     
@@ -316,9 +437,32 @@ def show_channels(handle, get_url, category=None, language=None):
     if not channels:
         xbmcgui.Dialog().notification('RevTV', 'No channels found or login required')
     
+    # Now & Next for the same language or category, pinned above the channels
+    scope = {k: v for k, v in (('category', category), ('language', language)) if v}
+    if channels and scope:
+        li = xbmcgui.ListItem(label='🕒 Now & Next')
+        li.setProperty('SpecialSort', 'top')
+        xbmcplugin.addDirectoryItem(handle, get_url(action='jiotv_now_next', **scope), li, isFolder=True)
+    
+    # Apply background health check results (dead channels last or hidden)
+    health = get_health_store().snapshot()
+    addon = get_addon()
+    dead_mode = addon.getSetting('health_dead_channels') or 'last'
+    slow_after = int(addon.getSetting('health_slow_threshold') or 3)
+    
+    def is_dead(ch):
+        entry = health.get(str(ch.get('channel_id')))
+        return entry is not None and not entry['ok']
+    
+    if health and dead_mode == 'hide':
+        channels = [ch for ch in channels if not is_dead(ch)]
+    elif health and dead_mode == 'last':
+        channels = sorted(channels, key=lambda ch: (is_dead(ch), ch.get('channel_name', '').lower()))
+    
     for ch in channels:
         channel_id = ch.get('channel_id')
         channel_name = ch.get('channel_name', 'Unknown')
+        entry = health.get(str(channel_id))
         logo_url = ch.get('logoUrl', '')
         
         # Build logo URL
@@ -326,7 +470,15 @@ def show_channels(handle, get_url, category=None, language=None):
             logo_url = f"https://jiotv.catchup.cdn.jio.com/dare_images/images/{logo_url}"
         
         # Create list item
-        li = xbmcgui.ListItem(label=channel_name)
+        label = channel_name
+        status = ''
+        if entry and not entry['ok']:
+            label = f"[COLOR gray]{channel_name} (offline)[/COLOR]"
+            status = ' | Offline'
+        elif entry and entry['latency'] > slow_after:
+            label = f"{channel_name} [COLOR yellow](slow)[/COLOR]"
+            status = f" | Slow ({entry['latency']:.1f}s)"
+        li = xbmcgui.ListItem(label=label)
         li.setArt({
             'thumb': logo_url,
             'icon': logo_url,
@@ -339,7 +491,7 @@ def show_channels(handle, get_url, category=None, language=None):
         li.setInfo('video', {
             'title': channel_name,
             'genre': cat_name,
-            'plotoutline': f"{lang_name} | {cat_name}",
+            'plotoutline': f"{lang_name} | {cat_name}{status}",
             'mediatype': 'video'
         })
         li.setProperty('IsPlayable', 'true')
@@ -347,59 +499,257 @@ def show_channels(handle, get_url, category=None, language=None):
         url = get_url(action='jiotv_play', channel_id=channel_id)
         xbmcplugin.addDirectoryItem(handle, url, li, isFolder=False)
     
+    if health and dead_mode == 'last':
+        xbmcplugin.addSortMethod(handle, xbmcplugin.SORT_METHOD_UNSORTED)
     xbmcplugin.addSortMethod(handle, xbmcplugin.SORT_METHOD_LABEL)
     xbmcplugin.endOfDirectory(handle)
 
 
+def get_epg_store():
+    """Programme guide shared between plugin calls."""
+    return EPGStore(os.path.join(PROFILE_PATH, 'epg.json'))
+
+
+def _parse_programmes(channel_id, epg):
+    """Convert JioTV EPG entries into EPGIndex programme dicts."""
+    programmes = []
+    for item in epg:
+        try:
+            programmes.append({
+                'channel_id': str(channel_id),
+                'title': item.get('showname', ''),
+                'start': int(item['startEpoch']) // 1000,
+                'end': int(item['endEpoch']) // 1000,
+                'description': item.get('description', ''),
+            })
+        except (KeyError, TypeError, ValueError):
+            continue
+    return programmes
+
+
+def _fetch_guide(api, channel_id, end):
+    """Fetch a channel's guide, adding tomorrow's when today's ends within the lookahead."""
+    def remaining():
+        return max(end - time.monotonic(), 0.1)
+    
+    programmes = _parse_programmes(channel_id, api.get_epg(channel_id, 0, timeout=remaining()))
+    if not programmes or max(p['end'] for p in programmes) < time.time() + LOOKAHEAD_SECONDS:
+        programmes += _parse_programmes(channel_id, api.get_epg(channel_id, 1, timeout=remaining()))
+    return programmes
+
+
+def refresh_epg(channel_ids, deadline=EPG_FETCH_DEADLINE, should_stop=None):
+    """Fetch guides for channels whose stored guide is missing, stale or running out.
+    
+    Returns the channels still without a guide because the deadline or
+    should_stop cut the batch short.
+    """
+    api = get_api()
+    store = get_epg_store()
+    missing = store.missing(channel_ids)
+    if not missing:
+        return []
+    
+    # Request timeouts are capped by the deadline so no worker outlives the batch
+    end = time.monotonic() + deadline
+    tasks = ((cid, lambda cid=cid: _fetch_guide(api, cid, end)) for cid in missing)
+    guides = {}
+    for result in BatchEngine().run(tasks, deadline=deadline, should_stop=should_stop):
+        if result.error is None:
+            # Empty guides are stored too, with a short TTL, so they are not refetched every call
+            guides[result.key] = result.value
+    log(f"Fetched EPG for {sum(1 for g in guides.values() if g)}/{len(missing)} channels")
+    if guides:
+        store.update(guides)
+    return [cid for cid in missing if cid not in guides]
+
+
+def prewarm_epg(should_stop=None):
+    """Refresh guides of recently listed channels so Now & Next opens without waiting."""
+    channel_ids = get_epg_store().wanted()
+    if channel_ids:
+        refresh_epg(channel_ids, deadline=EPG_PREWARM_DEADLINE, should_stop=should_stop)
+
+
+# Now & Next answers keyed by channel set, each valid until its next programme boundary
+_now_next_cache = {}
+
+
+def get_now_next(channel_ids):
+    """Return {channel_id: (now, next)}, recomputed only after a programme boundary."""
+    key = tuple(sorted(channel_ids))
+    cached = _now_next_cache.get(key)
+    if cached and cached[0] > time.time():
+        return cached[1]
+    
+    store = get_epg_store()
+    store.want(channel_ids)
+    incomplete = refresh_epg(channel_ids)
+    guide, valid_until = store.index(channel_ids).now_next(channel_ids)
+    if incomplete:
+        # The service is filling in the rest; look again soon
+        valid_until = min(valid_until, time.time() + EPG_INCOMPLETE_SECONDS)
+    _now_next_cache[key] = (valid_until, guide)
+    log(f"Now & Next valid until {_format_time(valid_until)}", xbmc.LOGDEBUG)
+    return guide
+
+
+def _format_time(ts):
+    return time.strftime('%H:%M', time.localtime(ts))
+
+
+def show_now_next(handle, get_url, category=None, language=None):
+    """Show what is on now and next for channels in a language or category."""
+    api = get_api()
+    xbmcplugin.setPluginCategory(handle, 'Now & Next')
+    xbmcplugin.setContent(handle, 'videos')
+    
+    cat_id = int(category) if category else None
+    lang_id = int(language) if language else None
+    channels = api.get_channels(language_id=lang_id, category_id=cat_id)
+    
+    if not channels:
+        xbmcgui.Dialog().notification('RevTV', 'No channels found or login required')
+    
+    channel_ids = [str(ch.get('channel_id')) for ch in channels]
+    guide = get_now_next(channel_ids)
+    
+    for ch in sorted(channels, key=lambda c: c.get('channel_name', '').lower()):
+        channel_id = ch.get('channel_id')
+        channel_name = ch.get('channel_name', 'Unknown')
+        now, upcoming = guide.get(str(channel_id), (None, None))
+        
+        logo_url = ch.get('logoUrl', '')
+        if logo_url and not logo_url.startswith('http'):
+            logo_url = f"https://jiotv.catchup.cdn.jio.com/dare_images/images/{logo_url}"
+        
+        label = channel_name
+        plot = []
+        if now:
+            label = f"{channel_name} [COLOR gray]· {now['title']}[/COLOR]"
+            plot.append(f"[B]Now:[/B] {now['title']} ({_format_time(now['start'])} - {_format_time(now['end'])})")
+            if now['description']:
+                plot.append(now['description'])
+        if upcoming:
+            plot.append(f"[B]Next:[/B] {upcoming['title']} ({_format_time(upcoming['start'])})")
+        
+        li = xbmcgui.ListItem(label=label)
+        li.setArt({'thumb': logo_url, 'icon': logo_url, 'fanart': logo_url})
+        li.setInfo('video', {
+            'title': channel_name,
+            'genre': CAT_NAMES.get(ch.get('channelCategoryId', 0), 'Unknown'),
+            'plot': '\n'.join(plot) or 'No guide data',
+            'plotoutline': now['title'] if now else '',
+            'mediatype': 'video'
+        })
+        li.setProperty('IsPlayable', 'true')
+        
+        url = get_url(action='jiotv_play', channel_id=channel_id)
+        xbmcplugin.addDirectoryItem(handle, url, li, isFolder=False)
+    
+    # Listing goes stale at the next programme boundary, so never cache it
+    xbmcplugin.endOfDirectory(handle, cacheToDisc=False)
+
+
+@lru_cache(maxsize=None)
+def _playback_properties(adaptive, quality):
+    """ListItem properties for a settings combination, built once per interpreter."""
+    properties = {}
+    if adaptive:
+        # Enable InputStream Adaptive for HLS
+        properties['inputstream'] = 'inputstream.adaptive'
+        properties['inputstream.adaptive.manifest_type'] = 'hls'
+        if quality in QUALITY_BANDWIDTH:
+            properties['inputstream.adaptive.max_bandwidth'] = str(QUALITY_BANDWIDTH[quality])
+    
+    # Set headers for Inputstream Adaptive (Critical for JioTV CDN)
+    properties['inputstream.adaptive.stream_headers'] = STREAM_HEADERS_STR
+    properties['inputstream.adaptive.manifest_headers'] = STREAM_HEADERS_STR
+    return properties
+
+
 def play_channel(handle, channel_id):
-    """Play a channel."""
-    if not api.is_logged_in():
+    """Play a channel.
+    
+    ListItem properties and the header string are built once per settings
+    combination, and the time from request to first frame is reported by
+    the service (see PLAY_START_PROPERTY).
+    """
+    start = time.time()
+    api = get_api()
+    if not api.is_logged_in() and not api.has_gateway():
         xbmcgui.Dialog().ok('RevTV', 'Please login first')
         return
     
     stream_url = api.get_playback_url(channel_id)
-    
+    if not stream_url and not api.is_logged_in():
+        xbmcgui.Dialog().ok('RevTV', 'Household gateway is unavailable. Please login to play directly.')
+        return
     if not stream_url:
         xbmcgui.Dialog().ok('RevTV', 'Failed to get stream URL. Please try again.')
         return
+    resolved = time.time()
     
     # Create playable item with adaptive streaming
+    addon = get_addon()
+    properties = _playback_properties(
+        addon.getSettingBool('adaptive_enabled'),
+        addon.getSetting('jiotv_quality') or 'auto'
+    )
     li = xbmcgui.ListItem(path=stream_url)
+    for key, value in properties.items():
+        li.setProperty(key, value)
+    li.setMimeType('application/vnd.apple.mpegurl')
+    li.setContentLookup(False)
     
-    # Enable InputStream Adaptive for HLS
-    if ADDON.getSettingBool('adaptive_enabled'):
-        li.setProperty('inputstream', 'inputstream.adaptive')
-        li.setProperty('inputstream.adaptive.manifest_type', 'hls')
-        
-        # Quality-based bandwidth limits for low bandwidth optimization
-        quality = ADDON.getSetting('jiotv_quality') or 'auto'
-        if quality == 'low':
-            li.setProperty('inputstream.adaptive.max_bandwidth', '500000')
-        elif quality == 'medium':
-            li.setProperty('inputstream.adaptive.max_bandwidth', '1500000')
-        if quality == 'high':
-            li.setProperty('inputstream.adaptive.max_bandwidth', '5000000')
-        # auto = no limit
+    xbmcgui.Window(10000).setProperty(PLAY_START_PROPERTY, f"{channel_id}:{start}")
+    xbmcplugin.setResolvedUrl(handle, True, li)
+    log(f"Playing channel {channel_id} (resolved in {(resolved - start) * 1000:.0f} ms)")
 
-    # Set headers for Inputstream Adaptive (Critical for JioTV CDN)
-    stream_headers_list = []
-    for k, v in BASE_HEADERS.items():
-        if k not in ('Accept', 'Content-Type'):
-             stream_headers_list.append(f"{k}={v}")
+
+def get_health_store():
+    """Channel health results shared between the service and the plugin."""
+    return HealthStore(os.path.join(PROFILE_PATH, 'channel_health.json'))
+
+
+def probe_channel(api, channel_id):
+    """Resolve a channel and fetch its master manifest; return latency or None.
     
-    stream_headers_str = '&'.join(stream_headers_list)
-    li.setProperty('inputstream.adaptive.stream_headers', stream_headers_str)
-    li.setProperty('inputstream.adaptive.manifest_headers', stream_headers_str)
+    Raises Unresolved when no stream URL comes back (expired login, gateway
+    down), since that says nothing about the channel itself.
+    """
+    start = time.time()
+    stream_url = api.get_playback_url(channel_id)
+    if not stream_url:
+        raise Unresolved(channel_id)
     
-    li.setMimeType('application/vnd.apple.mpegurl')
-    li.setContentLookup(False)
+    resp = api.get(stream_url, headers=STREAM_HEADERS, auth=False, timeout=15)
+    if resp.status_code != 200 or not resp.text.lstrip().startswith('#EXTM3U'):
+        log(f"Channel {channel_id} unhealthy: {resp.status_code}", xbmc.LOGDEBUG)
+        return None
+    return time.time() - start
+
+
+def check_channel_health(language_id=None, max_workers=4, should_stop=None):
+    """Probe channels in the background and record the results."""
+    api = get_api()
+    if not api.is_logged_in() and not api.has_gateway():
+        return {}
     
-    xbmcplugin.setResolvedUrl(handle, True, li)
-    log(f"Playing channel {channel_id}")
+    channels = api.get_channels(language_id=language_id)
+    checker = HealthChecker(
+        partial(probe_channel, api), get_health_store(),
+        max_workers=max_workers, should_stop=should_stop
+    )
+    results = checker.check([ch.get('channel_id') for ch in channels if ch.get('channel_id')])
+    dead = sum(1 for latency in results.values() if latency is None)
+    log(f"Health check: {len(results)} probed, {dead} offline")
+    return results
 
 
 def login():
     """Login with mobile number and OTP."""
+    api = get_api()
     dialog = xbmcgui.Dialog()
     
     # Get mobile number
@@ -422,7 +772,7 @@ def login():
     # Verify OTP
     dialog.notification('RevTV', 'Verifying...', time=2000)
     if api.verify_otp(mobile, otp):
-        ADDON.setSetting('jiotv_mobile', mobile)
+        get_addon().setSetting('jiotv_mobile', mobile)
         dialog.ok('RevTV', 'Login successful! You can now watch JioTV channels.')
         xbmc.executebuiltin('Container.Refresh')
         return True
@@ -433,10 +783,13 @@ def login():
 
 def logout():
     """Clear stored credentials."""
-    ADDON.setSetting('jiotv_token', '')
-    ADDON.setSetting('jiotv_refresh_token', '')
-    ADDON.setSetting('jiotv_subscriber_id', '')
-    ADDON.setSetting('jiotv_mobile', '')
+    api = get_api()
+    addon = get_addon()
+    addon.setSetting('jiotv_token', '')
+    addon.setSetting('jiotv_refresh_token', '')
+    addon.setSetting('jiotv_subscriber_id', '')
+    addon.setSetting('jiotv_mobile', '')
     api._load_credentials()
+    api.invalidate()
     xbmcgui.Dialog().ok('RevTV', 'Logged out successfully')
     xbmc.executebuiltin('Container.Refresh')
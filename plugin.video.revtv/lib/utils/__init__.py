@@ -1,3 +1,8 @@
 # -*- coding: utf-8 -*-
 """Utils Package"""
 from lib.utils.api_client import APIClient
+from lib.utils.ratelimit import TokenBucket, HostRateLimiter
+from lib.utils.health import HealthStore, HealthChecker, Unresolved
+from lib.utils.http import get_session, get_rate_limiter
+from lib.utils.batch import BatchEngine, BatchResult, BatchCancelled
+from lib.utils.epg import EPGIndex, EPGStore
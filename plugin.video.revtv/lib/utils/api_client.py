@@ -1,15 +1,19 @@
 # -*- coding: utf-8 -*-
 """API Client for RevTV - HTTP requests with retry and error handling."""
-import requests
 import xbmc
 
+from lib.utils.batch import BatchEngine, MAX_CONCURRENCY
+from lib.utils.http import get_session, get_rate_limiter
+
 class APIClient:
     def __init__(self, timeout=30):
-        self.session = requests.Session()
+        self.session = get_session()
+        self.limiter = get_rate_limiter()
         self.timeout = timeout
     
     def get(self, url, **kwargs):
         kwargs.setdefault('timeout', self.timeout)
+        self.limiter.acquire(url)
         try:
             return self.session.get(url, **kwargs)
         except Exception as e:
@@ -18,8 +22,14 @@ class APIClient:
     
     def post(self, url, **kwargs):
         kwargs.setdefault('timeout', self.timeout)
+        self.limiter.acquire(url)
         try:
             return self.session.post(url, **kwargs)
         except Exception as e:
             xbmc.log(f"[RevTV] POST error: {e}", xbmc.LOGERROR)
             raise
+    
+    def get_many(self, requests, deadline=None, max_workers=None, should_stop=None):
+        """GET many URLs concurrently; yields BatchResult as each completes."""
+        engine = BatchEngine(client=self, max_workers=max_workers or MAX_CONCURRENCY, timeout=self.timeout)
+        return engine.get_many(requests, deadline=deadline, should_stop=should_stop)
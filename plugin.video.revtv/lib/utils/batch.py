@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+Batch request engine for RevTV - Fan-out HTTP on a managed thread pool.
+
+Pure standard library plus requests, so it runs under Kodi's embedded
+Python. Results are yielded as they complete; the caller's iteration
+provides back-pressure, since new work is only submitted while fewer than
+`max_in_flight` tasks are outstanding.
+"""
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import xbmc
+
+# Process-wide cap on batch work running at once, shared by every engine
+MAX_CONCURRENCY = 8
+_slots = threading.BoundedSemaphore(MAX_CONCURRENCY)
+
+BatchResult = namedtuple('BatchResult', ['key', 'value', 'error', 'elapsed'])
+
+
+class BatchCancelled(Exception):
+    """Error of the results yielded for tasks dropped by cancel() or should_stop."""
+
+
+class BatchEngine:
+    """Runs many small tasks concurrently under a global concurrency cap.
+
+    `client` is any object with a requests-style `get(url, **kwargs)`,
+    e.g. a ServiceProvider, and is only needed for get_many(); it
+    defaults to a rate-limited APIClient.
+    """
+
+    def __init__(self, client=None, max_workers=MAX_CONCURRENCY, max_in_flight=None, timeout=15):
+        self.client = client
+        self.max_workers = max(1, min(int(max_workers), MAX_CONCURRENCY))
+        self.max_in_flight = max_in_flight or self.max_workers * 2
+        self.timeout = timeout
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        """Stop the batch; unfinished tasks are yielded with a BatchCancelled error.
+
+        Tasks already running finish in the background, like those
+        abandoned at the deadline.
+        """
+        self._cancelled.set()
+
+    @staticmethod
+    def _call(fn):
+        with _slots:
+            start = time.monotonic()
+            try:
+                return fn(), None, time.monotonic() - start
+            except Exception as e:
+                return None, e, time.monotonic() - start
+
+    def run(self, tasks, deadline=None, should_stop=None):
+        """Run (key, fn) pairs and yield a BatchResult for each as it completes.
+
+        Every task yields exactly one result. `deadline` is a number of
+        seconds for the whole batch; tasks not finished by then are yielded
+        with a TimeoutError. Abandoned tasks keep their concurrency slot until
+        they return, so tasks should bound their own I/O by the deadline
+        (get_many does this). `should_stop` is an optional callable (e.g.
+        Monitor.abortRequested) checked between completions, equivalent to
+        calling cancel(); unfinished tasks are then yielded with
+        BatchCancelled.
+        """
+        end = time.monotonic() + deadline if deadline else None
+
+        def stopped():
+            return self._cancelled.is_set() or (should_stop is not None and should_stop())
+
+        def dropped(error):
+            # Everything not yet yielded: outstanding futures, then unsubmitted tasks
+            keys = list(pending.values())
+            if not exhausted:
+                keys += [key for key, _fn in tasks]
+            return (BatchResult(key, None, error, 0) for key in keys)
+
+        pending = {}
+        tasks = iter(tasks)
+        exhausted = False
+        pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            while True:
+                while not exhausted and len(pending) < self.max_in_flight and not stopped():
+                    try:
+                        key, fn = next(tasks)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    pending[pool.submit(self._call, fn)] = key
+                if stopped():
+                    for future in pending:
+                        future.cancel()
+                    xbmc.log("[RevTV] Batch cancelled", xbmc.LOGDEBUG)
+                    yield from dropped(BatchCancelled('batch cancelled'))
+                    return
+                if not pending:
+                    return
+
+                remaining = end - time.monotonic() if end else None
+                if remaining is not None and remaining <= 0:
+                    # Abandon outstanding work; running tasks are bounded by their own timeouts
+                    yield from dropped(TimeoutError('batch deadline exceeded'))
+                    return
+                done, _ = wait(pending, timeout=remaining if remaining is not None else 1.0,
+                               return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = pending.pop(future)
+                    value, error, elapsed = future.result()
+                    yield BatchResult(key, value, error, elapsed)
+        finally:
+            for future in pending:
+                future.cancel()
+            pool.shutdown(wait=False)
+
+    def get_many(self, requests, deadline=None, should_stop=None):
+        """GET many URLs, yielding BatchResult(key, response, error, elapsed).
+
+        `requests` holds URLs or (key, url, kwargs) tuples; a bare URL is its
+        own key. Each request's timeout is capped by the time left before
+        the batch deadline.
+        """
+        end = time.monotonic() + deadline if deadline else None
+        if self.client is None:
+            from lib.utils.api_client import APIClient
+            self.client = APIClient(timeout=self.timeout)
+        client = self.client
+
+        def make_task(item):
+            if isinstance(item, str):
+                key, url, kwargs = item, item, {}
+            else:
+                key, url, kwargs = item
+            kwargs = dict(kwargs)
+
+            def fetch():
+                timeout = kwargs.pop('timeout', self.timeout)
+                if end is not None:
+                    timeout = min(timeout, max(end - time.monotonic(), 0.1))
+                return client.get(url, timeout=timeout, **kwargs)
+            return key, fetch
+
+        return self.run((make_task(item) for item in requests), deadline=deadline, should_stop=should_stop)
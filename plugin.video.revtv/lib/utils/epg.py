@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+EPG storage and time-bucket index for RevTV.
+
+Programmes are kept per channel in a JSON file in the addon profile. For
+queries they are loaded into an EPGIndex, which files each programme under
+every fixed-size time bucket it overlaps. "What is on now and next" for a
+set of channels then only touches the handful of buckets around the query
+time instead of every programme of every channel.
+
+Programme dicts use: channel_id (str), title, start, end (epoch seconds),
+description.
+"""
+import threading
+import time
+
+from lib.utils.jsonfile import read_json, write_json
+
+BUCKET_SECONDS = 1800
+LOOKAHEAD_SECONDS = 6 * 3600  # How far ahead to look for a "next" programme
+EPG_TTL = 6 * 3600  # Seconds before a channel's guide is fetched again
+RETRY_SECONDS = 1800  # Minimum wait before refetching an empty or short guide
+WANTED_SECONDS = 7 * 86400  # Channels listed within this window are kept fresh by the service
+
+# Guards read-modify-write of guide files; stores are created per call
+_lock = threading.Lock()
+
+
+class EPGIndex:
+    """Time-bucket index over programmes of many channels."""
+
+    def __init__(self, bucket_seconds=BUCKET_SECONDS):
+        self.bucket_seconds = bucket_seconds
+        self._buckets = {}
+
+    def _bucket(self, ts):
+        return int(ts) // self.bucket_seconds
+
+    def add(self, programmes):
+        for prog in programmes:
+            if prog['end'] <= prog['start']:
+                continue
+            for b in range(self._bucket(prog['start']), self._bucket(prog['end'] - 1) + 1):
+                self._buckets.setdefault(b, []).append(prog)
+
+    def now_next(self, channel_ids, at=None, lookahead=LOOKAHEAD_SECONDS):
+        """Return ({channel_id: (now, next)}, valid_until) for the given channels.
+
+        Either programme may be None. `valid_until` is the earliest
+        programme boundary among the results, after which the answer
+        changes and must be recomputed.
+        """
+        at = int(at or time.time())
+        wanted = {str(cid) for cid in channel_ids}
+        current = {}
+        upcoming = {}
+
+        first = self._bucket(at)
+        for prog in self._buckets.get(first, ()):
+            cid = prog['channel_id']
+            if cid in wanted and prog['start'] <= at < prog['end']:
+                current[cid] = prog
+
+        # Walk forward until every channel has a "next" that no later bucket can beat
+        for b in range(first, self._bucket(at + lookahead) + 1):
+            bucket_start = b * self.bucket_seconds
+            if len(upcoming) == len(wanted) and bucket_start > max(p['start'] for p in upcoming.values()):
+                break
+            for prog in self._buckets.get(b, ()):
+                cid = prog['channel_id']
+                if cid not in wanted:
+                    continue
+                after = current[cid]['end'] if cid in current else at
+                if prog['start'] >= after and (cid not in upcoming or prog['start'] < upcoming[cid]['start']):
+                    upcoming[cid] = prog
+
+        boundaries = [p['end'] for p in current.values()]
+        boundaries += [p['start'] for cid, p in upcoming.items() if cid not in current]
+        valid_until = min(boundaries) if boundaries else at + self.bucket_seconds
+        result = {cid: (current.get(cid), upcoming.get(cid)) for cid in wanted}
+        return result, valid_until
+
+
+class EPGStore:
+    """Per-channel programme lists persisted in the addon profile."""
+
+    def __init__(self, path, ttl=EPG_TTL):
+        self.path = path
+        self.ttl = ttl
+
+    def _is_missing(self, entry, now):
+        if entry is None or entry.get('expires', entry['fetched'] + self.ttl) <= now:
+            return True
+        # A guide that runs out within the lookahead (e.g. today's, late in the
+        # evening) needs refetching, but not more often than RETRY_SECONDS
+        covered = any(p['end'] > now + LOOKAHEAD_SECONDS for p in entry['programmes'])
+        return not covered and entry['fetched'] + RETRY_SECONDS <= now
+
+    def missing(self, channel_ids, now=None):
+        """Channels whose guide is absent, expired or does not cover the lookahead."""
+        now = now or time.time()
+        channels = read_json(self.path).get('channels', {})
+        return [str(cid) for cid in channel_ids if self._is_missing(channels.get(str(cid)), now)]
+
+    def update(self, guides, now=None):
+        """Store {channel_id: [programme, ...]} and drop programmes that have ended.
+
+        Empty guides are kept for RETRY_SECONDS so channels without guide
+        data are not fetched again on every query.
+        """
+        now = int(now or time.time())
+        with _lock:
+            data = read_json(self.path)
+            channels = data.setdefault('channels', {})
+            for cid, programmes in guides.items():
+                channels[str(cid)] = {
+                    'fetched': now,
+                    'expires': now + (self.ttl if programmes else RETRY_SECONDS),
+                    'programmes': programmes,
+                }
+            for entry in channels.values():
+                entry['programmes'] = [p for p in entry['programmes'] if p['end'] > now]
+            write_json(self.path, data)
+
+    def want(self, channel_ids, now=None):
+        """Note that these channels were listed, so the service keeps their guides fresh."""
+        now = int(now or time.time())
+        with _lock:
+            data = read_json(self.path)
+            wanted = data.get('wanted', {})
+            # Refresh timestamps at most hourly to keep listings from rewriting the file
+            if all(wanted.get(str(cid), 0) > now - 3600 for cid in channel_ids):
+                return
+            wanted = {cid: ts for cid, ts in wanted.items() if ts > now - WANTED_SECONDS}
+            wanted.update((str(cid), now) for cid in channel_ids)
+            data['wanted'] = wanted
+            write_json(self.path, data)
+
+    def wanted(self, now=None):
+        """Channels listed within WANTED_SECONDS."""
+        now = now or time.time()
+        wanted = read_json(self.path).get('wanted', {})
+        return [cid for cid, ts in wanted.items() if ts > now - WANTED_SECONDS]
+
+    def index(self, channel_ids=None):
+        """Build an EPGIndex, optionally limited to some channels."""
+        channels = read_json(self.path).get('channels', {})
+        wanted = {str(cid) for cid in channel_ids} if channel_ids is not None else None
+        index = EPGIndex()
+        for cid, entry in channels.items():
+            if wanted is None or cid in wanted:
+                index.add(entry['programmes'])
+        return index
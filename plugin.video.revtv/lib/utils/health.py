@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""Channel health checks for RevTV - Concurrent probing with expiring results."""
+import threading
+import time
+
+import xbmc
+
+from lib.utils.batch import BatchCancelled, BatchEngine
+from lib.utils.jsonfile import read_json, write_json
+
+HEALTH_TTL = 1800  # Seconds a probe result stays valid
+UNRESOLVED_ABORT = 5  # Abandon a run after this many unresolved probes and no resolved one
+
+# Guards read-modify-write of health files; stores are created per call
+_lock = threading.Lock()
+
+
+class Unresolved(Exception):
+    """Raised by a probe when no stream URL could be resolved.
+
+    That points at the account, token or gateway rather than the channel,
+    so it is never recorded as the channel being offline.
+    """
+
+
+class HealthStore:
+    """Probe results persisted as JSON so the service and plugin can share them."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def _read(self):
+        return read_json(self.path)
+
+    def snapshot(self):
+        """Return {channel_id: entry} for all unexpired entries."""
+        now = time.time()
+        return {k: v for k, v in self._read().items() if v.get('expires', 0) > now}
+
+    def get(self, channel_id):
+        return self.snapshot().get(str(channel_id))
+
+    def record(self, results, ttl=HEALTH_TTL):
+        """Merge {channel_id: latency or None} into the store."""
+        now = time.time()
+        with _lock:
+            data = {k: v for k, v in self._read().items() if v.get('expires', 0) > now}
+            for channel_id, latency in results.items():
+                data[str(channel_id)] = {
+                    'ok': latency is not None,
+                    'latency': round(latency, 3) if latency is not None else None,
+                    'checked': int(now),
+                    'expires': int(now + ttl),
+                }
+            write_json(self.path, data)
+
+    def clear(self):
+        """Forget all results, e.g. after the account changed."""
+        with _lock:
+            write_json(self.path, {})
+
+
+class HealthChecker:
+    """Runs a probe over many channels with bounded concurrency.
+
+    `probe(channel_id)` returns the latency in seconds for a healthy
+    channel, or None when the stream answered but is not playable. It
+    raises Unresolved when no stream URL could be resolved; that and any
+    other exception leave the channel unrecorded. A run in which the first
+    UNRESOLVED_ABORT probes all fail to resolve is abandoned.
+    """
+
+    def __init__(self, probe, store, max_workers=4, ttl=HEALTH_TTL, should_stop=None):
+        self.probe = probe
+        self.store = store
+        self.max_workers = max(1, int(max_workers))
+        self.ttl = ttl
+        self.should_stop = should_stop or (lambda: False)
+
+    def check(self, channel_ids):
+        """Probe all channels, store and return {channel_id: latency or None}.
+
+        Channels not reached before `should_stop` returns True, and channels
+        whose probe failed before reaching the stream, are left out.
+        """
+        tasks = ((cid, lambda cid=cid: self.probe(cid)) for cid in channel_ids)
+        engine = BatchEngine(max_workers=self.max_workers)
+        results = {}
+        unresolved = 0
+        for result in engine.run(tasks, should_stop=self.should_stop):
+            if isinstance(result.error, Unresolved):
+                unresolved += 1
+                if not results and unresolved >= UNRESOLVED_ABORT:
+                    xbmc.log("[RevTV] Health check abandoned: no stream URL resolves", xbmc.LOGWARNING)
+                    engine.cancel()
+            elif isinstance(result.error, BatchCancelled):
+                continue
+            elif result.error:
+                xbmc.log(f"[RevTV] Health probe {result.key} error: {result.error}", xbmc.LOGDEBUG)
+            else:
+                results[result.key] = result.value
+        if results:
+            self.store.record(results, self.ttl)
+        return results
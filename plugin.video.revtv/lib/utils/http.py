@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""Shared HTTP resources for RevTV - One pooled session and rate limiter per process."""
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from lib.utils.ratelimit import HostRateLimiter
+
+# Connection pool sizing: urllib3 keeps one pool per host; POOL_HOSTS is how
+# many host pools stay cached, POOL_MAXSIZE how many keep-alive connections
+# each pool holds (enough for the health checker and batch fetches).
+POOL_HOSTS = 16
+POOL_MAXSIZE = 16
+
+# Default limit for hosts without an explicit entry (requests/sec, burst)
+DEFAULT_RATE_LIMIT = (5.0, 10)
+
+_sessions = {}
+_limiter = None
+_lock = threading.Lock()
+
+
+def _build_session(retry):
+    if retry:
+        retry = Retry(
+            total=2, connect=2, read=0, status=0,
+            backoff_factor=0.3, allowed_methods=frozenset(['GET', 'HEAD'])
+        )
+    else:
+        retry = 0
+    adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_session(retry=True):
+    """Return the process-wide pooled requests.Session.
+
+    retry=False returns a second pooled session that gives up on the first
+    connection error, for hosts that have a faster fallback than retrying.
+    """
+    with _lock:
+        if retry not in _sessions:
+            _sessions[retry] = _build_session(retry)
+        return _sessions[retry]
+
+
+def get_rate_limiter():
+    """Return the process-wide per-host rate limiter."""
+    global _limiter
+    with _lock:
+        if _limiter is None:
+            _limiter = HostRateLimiter(*DEFAULT_RATE_LIMIT)
+        return _limiter
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""JSON file helpers for RevTV - Shared state files in the addon profile."""
+import json
+import os
+import tempfile
+
+
+def read_json(path, default=None):
+    """Load JSON from path, returning `default` ({}) if missing or corrupt."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {} if default is None else default
+
+
+def write_json(path, data):
+    """Write JSON atomically so concurrent readers never see a partial file."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    # Unique temp file per writer; the service and plugin may write at once
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.json')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
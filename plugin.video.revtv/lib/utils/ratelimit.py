@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""Rate limiting for RevTV - Token buckets keyed by upstream host."""
+import threading
+import time
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, up to `burst` stored."""
+
+    def __init__(self, rate, burst):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self._tokens = self.burst
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        """Take a token, returning how long the caller must wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0
+            return -self._tokens / self.rate
+
+    def acquire(self):
+        """Block until a token is available."""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+
+class HostRateLimiter:
+    """One TokenBucket per host, created on first use."""
+
+    def __init__(self, rate=2.0, burst=4, limits=None):
+        self.default = (rate, burst)
+        self.limits = dict(limits or {})
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def set_limit(self, host, rate, burst):
+        """Set the limit for a host, replacing any bucket already in use."""
+        with self._lock:
+            if self.limits.get(host) != (rate, burst):
+                self.limits[host] = (rate, burst)
+                self._buckets.pop(host, None)
+
+    def bucket(self, host):
+        with self._lock:
+            if host not in self._buckets:
+                rate, burst = self.limits.get(host, self.default)
+                self._buckets[host] = TokenBucket(rate, burst)
+            return self._buckets[host]
+
+    def acquire(self, url):
+        """Block until a request to `url`'s host is allowed."""
+        self.bucket(urlparse(url).netloc).acquire()
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+RevTV Background Service
+
+Runs for the lifetime of Kodi. Hosts the household gateway when this
+device is configured as the gateway server, periodically probes channel
+health so listings can hide or demote dead channels, keeps programme
+guides fresh for channels shown in Now & Next, and reports
+time-to-first-frame for channels started by the plugin.
+
+Copyright (c) 2025 surevs - MIT License
+"""
+import os
+import time
+
+import xbmc
+import xbmcaddon
+import xbmcgui
+import xbmcvfs
+
+from lib.gateway import GatewayServer
+from lib.gateway.server import DEFAULT_PORT
+from lib.services import jiotv
+from lib.utils.jsonfile import read_json, write_json
+
+TICK_SECONDS = 30
+HEALTH_SETTINGS = (
+    'health_check_enabled', 'health_check_language',
+    'health_check_interval', 'health_check_concurrency',
+)
+PLAY_STATS_KEEP = 50
+
+
+def log(message, level=xbmc.LOGINFO):
+    """Log message to Kodi log."""
+    xbmc.log(f"[RevTV:Service] {message}", level)
+
+
+class PlaybackMonitor(xbmc.Player):
+    """Measures time from the plugin's play request to the first frame."""
+
+    def __init__(self):
+        super().__init__()
+        self.window = xbmcgui.Window(10000)
+
+    def onAVStarted(self):
+        marker = self.window.getProperty(jiotv.PLAY_START_PROPERTY)
+        if not marker:
+            return
+        self.window.clearProperty(jiotv.PLAY_START_PROPERTY)
+        channel_id, start = marker.rsplit(':', 1)
+        ttff = time.time() - float(start)
+        log(f"Channel {channel_id} time-to-first-frame: {ttff * 1000:.0f} ms")
+
+        profile = xbmcvfs.translatePath(xbmcaddon.Addon().getAddonInfo('profile'))
+        path = os.path.join(profile, 'playback_stats.json')
+        plays = read_json(path, default=[])
+        plays.append({'channel_id': channel_id, 'ttff': round(ttff, 3), 'at': int(time.time())})
+        write_json(path, plays[-PLAY_STATS_KEEP:])
+
+    def onPlayBackError(self):
+        self.window.clearProperty(jiotv.PLAY_START_PROPERTY)
+
+    def onPlayBackStopped(self):
+        self.window.clearProperty(jiotv.PLAY_START_PROPERTY)
+
+
+class RevTVService(xbmc.Monitor):
+    """Kodi monitor that keeps background components in sync with settings."""
+
+    def __init__(self):
+        super().__init__()
+        self.gateway = None
+        self.gateway_settings = None
+        self.last_health_check = 0
+        self.health_settings = self._settings(HEALTH_SETTINGS)
+        self.player = PlaybackMonitor()
+
+    def onSettingsChanged(self):
+        # Token and device id writes also land here, some from the gateway's
+        # own request handlers; only act on the settings each part uses
+        gateway_settings = self._settings(jiotv.GATEWAY_SETTINGS)
+        if gateway_settings != self.gateway_settings:
+            self.configure_gateway()
+        health_settings = self._settings(HEALTH_SETTINGS)
+        if health_settings != self.health_settings:
+            self.health_settings = health_settings
+            self.last_health_check = 0
+
+    @staticmethod
+    def _settings(keys):
+        addon = xbmcaddon.Addon()
+        return tuple(addon.getSetting(k) for k in keys)
+
+    def configure_gateway(self):
+        """Start, restart or stop the gateway server to match settings."""
+        self.stop_gateway()
+        self.gateway_settings = self._settings(jiotv.GATEWAY_SETTINGS)
+
+        addon = xbmcaddon.Addon()
+        if addon.getSetting('gateway_mode') != 'server':
+            return
+
+        key = addon.getSetting('gateway_key')
+        if not key:
+            log("Gateway server enabled but no key set", xbmc.LOGWARNING)
+            return
+
+        port = int(addon.getSetting('gateway_port') or DEFAULT_PORT)
+        try:
+            # get_api() reloads credentials as they change, so no restart is needed
+            self.gateway = GatewayServer(jiotv.get_api, key, port=port)
+            self.gateway.start()
+        except Exception as e:
+            log(f"Failed to start gateway: {e}", xbmc.LOGERROR)
+            self.gateway = None
+
+    def stop_gateway(self):
+        if self.gateway:
+            self.gateway.stop()
+            self.gateway = None
+
+    def run_health_check(self):
+        """Probe channel health if enabled and the interval has elapsed."""
+        addon = xbmcaddon.Addon()
+        if not addon.getSettingBool('health_check_enabled'):
+            return
+        interval = int(addon.getSetting('health_check_interval') or 60) * 60
+        if time.time() - self.last_health_check < interval:
+            return
+        self.last_health_check = time.time()
+
+        language = int(addon.getSetting('health_check_language') or 0)
+        try:
+            jiotv.check_channel_health(
+                language_id=language or None,
+                max_workers=int(addon.getSetting('health_check_concurrency') or 4),
+                should_stop=self.abortRequested
+            )
+        except Exception as e:
+            log(f"Health check failed: {e}", xbmc.LOGERROR)
+
+    def run_epg_prewarm(self):
+        """Refresh guides the plugin listed before they are needed again."""
+        try:
+            jiotv.prewarm_epg(should_stop=self.abortRequested)
+        except Exception as e:
+            log(f"EPG refresh failed: {e}", xbmc.LOGERROR)
+
+    def run(self):
+        log("Started")
+        self.configure_gateway()
+        while not self.abortRequested():
+            self.run_health_check()
+            self.run_epg_prewarm()
+            if self.waitForAbort(TICK_SECONDS):
+                break
+        self.stop_gateway()
+        log("Stopped")
+
+
+if __name__ == '__main__':
+    RevTVService().run()
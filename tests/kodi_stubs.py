@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+Minimal stand-ins for the xbmc* modules so RevTV library code runs outside Kodi.
+
+Import this before anything from the addon. Settings live in SETTINGS, window
+properties in WINDOW_PROPERTIES, directory listings are collected in
+DIRECTORY and the addon profile is a temporary directory. Run the tests with:
+python -m unittest discover tests
+"""
+import os
+import sys
+import tempfile
+import types
+
+ADDON_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'plugin.video.revtv')
+PROFILE_DIR = tempfile.mkdtemp(prefix='revtv-test-')
+SETTINGS = {}
+WINDOW_PROPERTIES = {}
+DIRECTORY = []  # (url, ListItem, is_folder) added by the last listing
+
+
+def _install():
+    xbmc = types.ModuleType('xbmc')
+    xbmc.LOGDEBUG, xbmc.LOGINFO, xbmc.LOGWARNING, xbmc.LOGERROR = 0, 1, 2, 3
+    xbmc.log = lambda message, level=1: None
+    xbmc.executebuiltin = lambda command: None
+    xbmc.Monitor = type('Monitor', (), {'abortRequested': lambda self: False})
+    xbmc.Player = type('Player', (), {})
+
+    class Addon:
+        def __init__(self, *args):
+            pass
+
+        def getSetting(self, key):
+            return SETTINGS.get(key, '')
+
+        def getSettingBool(self, key):
+            return SETTINGS.get(key) == 'true'
+
+        def setSetting(self, key, value):
+            SETTINGS[key] = value
+
+        def getAddonInfo(self, key):
+            return {'profile': PROFILE_DIR, 'name': 'RevTV', 'id': 'plugin.video.revtv'}.get(key, '')
+
+    class Window:
+        def __init__(self, window_id=None):
+            self.properties = WINDOW_PROPERTIES
+
+        def getProperty(self, key):
+            return self.properties.get(key, '')
+
+        def setProperty(self, key, value):
+            self.properties[key] = value
+
+        def clearProperty(self, key):
+            self.properties.pop(key, None)
+
+    class ListItem:
+        def __init__(self, label='', path=''):
+            self.label = label
+            self.path = path
+            self.properties = {}
+
+        def setProperty(self, key, value):
+            self.properties[key] = value
+
+        def __getattr__(self, name):
+            # setArt, setInfo, setMimeType, ... are accepted and ignored
+            return lambda *args, **kwargs: None
+
+    class Dialog:
+        def __getattr__(self, name):
+            return lambda *args, **kwargs: None
+
+    xbmcaddon = types.ModuleType('xbmcaddon')
+    xbmcaddon.Addon = Addon
+    xbmcvfs = types.ModuleType('xbmcvfs')
+    xbmcvfs.translatePath = lambda path: path
+    xbmcgui = types.ModuleType('xbmcgui')
+    xbmcgui.Window = Window
+    xbmcgui.ListItem = ListItem
+    xbmcgui.Dialog = Dialog
+    xbmcplugin = types.ModuleType('xbmcplugin')
+    xbmcplugin.SORT_METHOD_UNSORTED, xbmcplugin.SORT_METHOD_LABEL = 0, 1
+    xbmcplugin.addDirectoryItem = lambda handle, url, li, isFolder=False: DIRECTORY.append((url, li, isFolder))
+    for name in ('setPluginCategory', 'setContent', 'addSortMethod', 'endOfDirectory', 'setResolvedUrl'):
+        setattr(xbmcplugin, name, lambda *args, **kwargs: None)
+    sys.modules.update({
+        'xbmc': xbmc,
+        'xbmcaddon': xbmcaddon,
+        'xbmcgui': xbmcgui,
+        'xbmcplugin': xbmcplugin,
+        'xbmcvfs': xbmcvfs,
+    })
+
+
+if 'xbmc' not in sys.modules:
+    _install()
+    sys.path.insert(0, ADDON_DIR)
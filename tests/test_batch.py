@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""Tests for the thread-pool batch engine."""
+import time
+import unittest
+
+import kodi_stubs  # noqa: F401
+
+from lib.utils.api_client import APIClient
+from lib.utils.batch import BatchCancelled, BatchEngine
+
+
+class BatchEngineTest(unittest.TestCase):
+
+    def test_results_arrive_as_completed(self):
+        tasks = [(delay, lambda delay=delay: time.sleep(delay) or delay) for delay in (0.2, 0.0, 0.1)]
+        keys = [r.key for r in BatchEngine(max_workers=3).run(tasks)]
+        self.assertEqual(keys, [0.0, 0.1, 0.2])
+
+    def test_errors_are_reported_per_task(self):
+        def boom():
+            raise ValueError('bad')
+        results = {r.key: r for r in BatchEngine().run([('ok', lambda: 1), ('bad', boom)])}
+        self.assertEqual(results['ok'].value, 1)
+        self.assertIsInstance(results['bad'].error, ValueError)
+
+    def test_deadline_times_out_unfinished_tasks(self):
+        tasks = [('fast', lambda: 1), ('slow', lambda: time.sleep(1))]
+        start = time.monotonic()
+        results = {r.key: r for r in BatchEngine(max_workers=2).run(tasks, deadline=0.2)}
+        self.assertLess(time.monotonic() - start, 0.6)
+        self.assertEqual(results['fast'].value, 1)
+        self.assertIsInstance(results['slow'].error, TimeoutError)
+
+    def test_cancel_yields_dropped_tasks(self):
+        engine = BatchEngine(max_workers=1, max_in_flight=1)
+        ran = []
+        results = []
+        for result in engine.run((i, lambda i=i: ran.append(i) or i) for i in range(100)):
+            results.append(result)
+            engine.cancel()
+        self.assertEqual(ran, [0])
+        self.assertEqual([r.key for r in results], list(range(100)))
+        self.assertTrue(all(isinstance(r.error, BatchCancelled) for r in results[1:]))
+
+    def test_should_stop_before_start(self):
+        results = list(BatchEngine().run([('a', lambda: 1), ('b', lambda: 2)], should_stop=lambda: True))
+        self.assertEqual([r.key for r in results], ['a', 'b'])
+        self.assertTrue(all(isinstance(r.error, BatchCancelled) for r in results))
+
+    def test_get_many_forwards_should_stop(self):
+        results = list(APIClient().get_many(['http://127.0.0.1:9/'], should_stop=lambda: True))
+        self.assertEqual(len(results), 1)
+        self.assertIsInstance(results[0].error, BatchCancelled)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""Tests for the EPG time-bucket index and on-disk store."""
+import os
+import tempfile
+import unittest
+
+from kodi_stubs import PROFILE_DIR
+
+from lib.utils.epg import EPGIndex, EPGStore, LOOKAHEAD_SECONDS, RETRY_SECONDS, WANTED_SECONDS
+
+
+class EPGIndexTest(unittest.TestCase):
+
+    @staticmethod
+    def _programme(channel_id, title, start, end):
+        return {'channel_id': channel_id, 'title': title, 'start': start, 'end': end, 'description': ''}
+
+    def test_now_next_across_buckets(self):
+        index = EPGIndex(bucket_seconds=1800)
+        index.add([
+            self._programme('1', 'Morning', 0, 3600),
+            self._programme('1', 'Noon', 3600, 9000),
+            self._programme('2', 'Film', 600, 7200),
+            self._programme('2', 'Late', 9000, 10000),
+        ])
+        guide, valid_until = index.now_next(['1', '2', '3'], at=1000)
+        self.assertEqual(guide['1'][0]['title'], 'Morning')
+        self.assertEqual(guide['1'][1]['title'], 'Noon')
+        self.assertEqual(guide['2'][0]['title'], 'Film')
+        self.assertEqual(guide['2'][1]['title'], 'Late')
+        self.assertEqual(guide['3'], (None, None))
+        self.assertEqual(valid_until, 3600)
+
+    def test_gap_before_next_programme(self):
+        index = EPGIndex()
+        index.add([self._programme('1', 'Later', 5000, 6000)])
+        guide, valid_until = index.now_next(['1'], at=1000)
+        self.assertEqual(guide['1'], (None, index._buckets[2][0]))
+        self.assertEqual(valid_until, 5000)
+
+
+class EPGStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.store = EPGStore(os.path.join(tempfile.mkdtemp(dir=PROFILE_DIR), 'epg.json'))
+        self.now = 1_000_000
+
+    def _programme(self, end):
+        return {'channel_id': '1', 'title': 'Show', 'start': end - 1800, 'end': end, 'description': ''}
+
+    def test_unknown_channel_is_missing(self):
+        self.assertEqual(self.store.missing(['1'], now=self.now), ['1'])
+
+    def test_covered_guide_is_fresh(self):
+        self.store.update({'1': [self._programme(self.now + LOOKAHEAD_SECONDS + 60)]}, now=self.now)
+        self.assertEqual(self.store.missing(['1'], now=self.now + 60), [])
+
+    def test_guide_that_ran_out_is_missing(self):
+        self.store.update({'1': [self._programme(self.now + 600)]}, now=self.now)
+        self.assertEqual(self.store.missing(['1'], now=self.now + RETRY_SECONDS), ['1'])
+
+    def test_empty_guide_waits_for_retry(self):
+        self.store.update({'1': []}, now=self.now)
+        self.assertEqual(self.store.missing(['1'], now=self.now + 60), [])
+        self.assertEqual(self.store.missing(['1'], now=self.now + RETRY_SECONDS), ['1'])
+
+    def test_wanted_channels_survive_updates(self):
+        self.store.want(['1', '2'], now=self.now)
+        self.store.update({'1': [self._programme(self.now + 600)]}, now=self.now)
+        self.assertEqual(sorted(self.store.wanted(now=self.now)), ['1', '2'])
+        self.assertEqual(self.store.wanted(now=self.now + WANTED_SECONDS), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""Tests for the household gateway server and client."""
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from kodi_stubs import SETTINGS
+
+from lib.gateway import GatewayServer, GatewayClient
+
+
+def _free_port():
+    """A port with nothing listening on it."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class _FakeJioTV:
+    """Stands in for JioTVAPI behind the gateway."""
+
+    def __init__(self):
+        self.channel_calls = 0
+
+    def get_all_channels(self):
+        self.channel_calls += 1
+        return [{'channel_id': 1, 'channel_name': 'Gemini TV'}]
+
+    def get_epg(self, channel_id, offset=0):
+        return [] if channel_id == '2' else [{'showname': 'News'}]
+
+    def get_playback_url(self, channel_id):
+        return None if channel_id == '9' else f'https://cdn.example/{channel_id}.m3u8'
+
+
+class GatewayTest(unittest.TestCase):
+
+    def setUp(self):
+        self.api = _FakeJioTV()
+        self.server = GatewayServer(lambda: self.api, 'secret', port=0, host='127.0.0.1')
+        self.server.start()
+        self.client = GatewayClient('127.0.0.1', 'secret', port=self.server.port)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_round_trip_is_cached(self):
+        self.assertEqual(self.client.get_channels(), [{'channel_id': 1, 'channel_name': 'Gemini TV'}])
+        self.client.get_channels()
+        self.assertEqual(self.api.channel_calls, 1)
+        self.assertEqual(self.client.get_epg(1), [{'showname': 'News'}])
+        self.assertEqual(self.client.get_playback_url(5), 'https://cdn.example/5.m3u8')
+
+    def test_empty_epg_is_an_answer(self):
+        self.assertEqual(self.client.get_epg(2), [])
+
+    def test_unresolvable_channel_returns_none(self):
+        self.assertIsNone(self.client.get_playback_url(9))
+
+    def test_wrong_key_is_rejected(self):
+        intruder = GatewayClient('127.0.0.1', 'guess', port=self.server.port)
+        self.assertIsNone(intruder.get_channels())
+
+    def test_client_falls_back_to_direct(self):
+        channels = {'result': [{'channel_id': 7, 'channelLanguageId': 11}]}
+
+        class Upstream(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = json.dumps(channels).encode()
+                self.send_response(200)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        upstream = ThreadingHTTPServer(('127.0.0.1', 0), Upstream)
+        threading.Thread(target=upstream.serve_forever, daemon=True).start()
+        self.addCleanup(upstream.server_close)
+        self.addCleanup(upstream.shutdown)
+
+        SETTINGS.update(gateway_mode='client', gateway_host='127.0.0.1',
+                        gateway_key='secret', gateway_port=str(_free_port()))
+        self.addCleanup(SETTINGS.clear)
+        from lib.services import jiotv
+        endpoint = jiotv.API_ENDPOINTS['channels']
+        jiotv.API_ENDPOINTS['channels'] = f'http://127.0.0.1:{upstream.server_address[1]}/channels'
+        self.addCleanup(jiotv.API_ENDPOINTS.__setitem__, 'channels', endpoint)
+
+        api = jiotv.JioTVAPI()
+        self.assertTrue(api.has_gateway())
+        self.assertFalse(api.is_logged_in())
+        self.assertEqual(api.get_channels(language_id=11), channels['result'])
+
+
+# A gateway in its own interpreter, so the client sees a real process go away
+GATEWAY_PROCESS = """
+import sys, time
+import kodi_stubs
+from lib.gateway import GatewayServer
+
+class API:
+    def get_all_channels(self):
+        return [{'channel_id': 1}]
+
+    def get_epg(self, channel_id, offset=0):
+        time.sleep(2)
+        return [{'showname': 'Late'}]
+
+server = GatewayServer(API, 'secret', port=0, host='127.0.0.1')
+server.start()
+print(server.port, flush=True)
+sys.stdin.read()
+"""
+
+
+class GatewayProcessTest(unittest.TestCase):
+
+    def setUp(self):
+        self.process = subprocess.Popen(
+            [sys.executable, '-c', GATEWAY_PROCESS], cwd=os.path.dirname(os.path.abspath(__file__)),
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True
+        )
+        self.addCleanup(self.process.wait)
+        self.addCleanup(self.process.kill)
+        self.client = GatewayClient('127.0.0.1', 'secret', port=int(self.process.stdout.readline()))
+
+    def test_powered_off_gateway_is_skipped(self):
+        self.assertEqual(self.client.get_channels(), [{'channel_id': 1}])
+        self.process.kill()
+        self.process.wait()
+
+        start = time.monotonic()
+        self.assertIsNone(self.client.get_channels())
+        self.assertLess(time.monotonic() - start, 0.25)  # No connect retries with backoff
+        self.assertTrue(self.client.is_down())
+        self.assertIsNone(self.client.get_playback_url(1))
+
+    def test_epg_timeout_is_forwarded(self):
+        start = time.monotonic()
+        self.assertIsNone(self.client.get_epg(1, timeout=0.3))
+        self.assertLess(time.monotonic() - start, 1.5)
+        self.assertFalse(self.client.is_down())  # Slow is not down
+
+
+if __name__ == '__main__':
+    unittest.main()
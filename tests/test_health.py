@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""Tests for channel health probing and the health store."""
+import os
+import tempfile
+import threading
+import unittest
+
+from kodi_stubs import PROFILE_DIR
+
+from lib.utils.health import HealthChecker, HealthStore, Unresolved, UNRESOLVED_ABORT
+
+
+class HealthStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.store = HealthStore(os.path.join(tempfile.mkdtemp(dir=PROFILE_DIR), 'health.json'))
+
+    def test_record_and_snapshot(self):
+        self.store.record({1: 0.5, 2: None})
+        self.assertEqual(self.store.get(1)['latency'], 0.5)
+        self.assertTrue(self.store.get(1)['ok'])
+        self.assertFalse(self.store.get('2')['ok'])
+
+    def test_expired_entries_are_dropped(self):
+        self.store.record({1: 0.5}, ttl=-1)
+        self.assertEqual(self.store.snapshot(), {})
+
+    def test_clear(self):
+        self.store.record({1: 0.5})
+        self.store.clear()
+        self.assertEqual(self.store.snapshot(), {})
+
+
+class HealthCheckerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.store = HealthStore(os.path.join(tempfile.mkdtemp(dir=PROFILE_DIR), 'health.json'))
+
+    def test_only_reached_streams_are_recorded(self):
+        def probe(channel_id):
+            if channel_id == 'unresolved':
+                raise Unresolved(channel_id)
+            if channel_id == 'raised':
+                raise ConnectionError('network down')
+            return None if channel_id == 'dead' else 0.2
+
+        results = HealthChecker(probe, self.store).check(['live', 'dead', 'unresolved', 'raised'])
+        self.assertEqual(results, {'live': 0.2, 'dead': None})
+        self.assertEqual(set(self.store.snapshot()), {'live', 'dead'})
+
+    def test_run_stops_when_nothing_resolves(self):
+        calls = []
+        lock = threading.Lock()
+
+        def probe(channel_id):
+            with lock:
+                calls.append(channel_id)
+            raise Unresolved(channel_id)
+
+        results = HealthChecker(probe, self.store, max_workers=1).check(range(100))
+        self.assertEqual(results, {})
+        self.assertLess(len(calls), UNRESOLVED_ABORT + 5)
+        self.assertEqual(self.store.snapshot(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""Tests for the JioTV service module's listings and shared client."""
+import json
+import os
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from kodi_stubs import DIRECTORY, PROFILE_DIR, SETTINGS
+
+from lib.services import jiotv
+
+CHANNELS = [
+    {'channel_id': 1, 'channel_name': 'Alpha', 'channelLanguageId': 11},
+    {'channel_id': 2, 'channel_name': 'Bravo', 'channelLanguageId': 11},
+    {'channel_id': 3, 'channel_name': 'Charlie', 'channelLanguageId': 11},
+]
+
+
+def _listed():
+    return [li.label for url, li, is_folder in DIRECTORY if not is_folder]
+
+
+def _get_url(**kwargs):
+    return '&'.join(f'{k}={v}' for k, v in sorted(kwargs.items()))
+
+
+class ShowChannelsTest(unittest.TestCase):
+
+    def setUp(self):
+        SETTINGS['jiotv_token'] = 'token'
+        self.addCleanup(SETTINGS.clear)
+        api = jiotv.get_api()
+        api.invalidate()
+        api._cache['channels'] = (time.time() + 600, CHANNELS)
+        jiotv.get_health_store().record({1: None, 2: 0.4, 3: 9.0})
+        self.addCleanup(jiotv.get_health_store().clear)
+        DIRECTORY.clear()
+
+    def test_dead_channels_last(self):
+        SETTINGS['health_dead_channels'] = 'last'
+        jiotv.show_channels(1, _get_url, language='11')
+        self.assertEqual(_listed(), [
+            'Bravo', 'Charlie [COLOR yellow](slow)[/COLOR]', '[COLOR gray]Alpha (offline)[/COLOR]',
+        ])
+
+    def test_dead_channels_hidden(self):
+        SETTINGS['health_dead_channels'] = 'hide'
+        jiotv.show_channels(1, _get_url, language='11')
+        self.assertEqual(_listed(), ['Bravo', 'Charlie [COLOR yellow](slow)[/COLOR]'])
+
+    def test_now_next_entry_for_the_same_language(self):
+        jiotv.show_channels(1, _get_url, language='11')
+        url, li, is_folder = DIRECTORY[0]
+        self.assertTrue(is_folder)
+        self.assertEqual(url, 'action=jiotv_now_next&language=11')
+        self.assertEqual(li.properties['SpecialSort'], 'top')
+
+    def test_login_change_forgets_health(self):
+        SETTINGS['jiotv_token'] = 'other-account'
+        jiotv.get_api()
+        self.assertEqual(jiotv.get_health_store().snapshot(), {})
+
+
+class GetAPITest(unittest.TestCase):
+
+    def setUp(self):
+        SETTINGS['jiotv_token'] = 'first'
+        self.addCleanup(SETTINGS.clear)
+
+    def test_client_is_reused(self):
+        self.assertIs(jiotv.get_api(), jiotv.get_api())
+
+    def test_token_change_reloads_credentials(self):
+        api = jiotv.get_api()
+        api._cache['channels'] = (time.time() + 600, CHANNELS)
+        jiotv._now_next_cache[('1',)] = (time.time() + 600, {})
+        SETTINGS['jiotv_token'] = 'second'
+        self.assertIs(jiotv.get_api(), api)
+        self.assertEqual(api.access_token, 'second')
+        self.assertNotIn('channels', api._cache)
+        self.assertEqual(jiotv._now_next_cache, {})
+
+    def test_gateway_change_rebuilds_client(self):
+        api = jiotv.get_api()
+        SETTINGS.update(gateway_mode='client', gateway_host='127.0.0.1', gateway_key='secret')
+        rebuilt = jiotv.get_api()
+        self.assertIsNot(rebuilt, api)
+        self.assertTrue(rebuilt.has_gateway())
+
+
+class _Guide(BaseHTTPRequestHandler):
+    """Serves a one-programme guide that covers the lookahead."""
+
+    def do_GET(self):
+        now = int(time.time())
+        body = json.dumps({'epg': [{
+            'showname': 'All Day', 'startEpoch': (now - 60) * 1000, 'endEpoch': (now + 86400) * 1000,
+        }]}).encode()
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class EPGRefreshTest(unittest.TestCase):
+
+    def setUp(self):
+        upstream = ThreadingHTTPServer(('127.0.0.1', 0), _Guide)
+        threading.Thread(target=upstream.serve_forever, daemon=True).start()
+        self.addCleanup(upstream.server_close)
+        self.addCleanup(upstream.shutdown)
+        endpoint = jiotv.API_ENDPOINTS['epg']
+        jiotv.API_ENDPOINTS['epg'] = f'http://127.0.0.1:{upstream.server_address[1]}/epg'
+        self.addCleanup(jiotv.API_ENDPOINTS.__setitem__, 'epg', endpoint)
+        path = os.path.join(PROFILE_DIR, 'epg.json')
+        if os.path.exists(path):
+            os.remove(path)
+
+    def test_prewarm_fetches_listed_channels(self):
+        store = jiotv.get_epg_store()
+        store.want(['5'])
+        jiotv.prewarm_epg()
+        self.assertEqual(store.missing(['5']), [])
+
+    def test_stopped_refresh_reports_incomplete(self):
+        self.assertEqual(jiotv.refresh_epg(['6'], should_stop=lambda: True), ['6'])
+        self.assertEqual(jiotv.get_epg_store().missing(['6']), ['6'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""Tests for the atomic JSON state files."""
+import os
+import tempfile
+import threading
+import unittest
+
+from kodi_stubs import PROFILE_DIR
+
+from lib.utils.jsonfile import read_json, write_json
+
+
+class JSONFileTest(unittest.TestCase):
+
+    def test_concurrent_writers(self):
+        path = os.path.join(tempfile.mkdtemp(dir=PROFILE_DIR), 'state.json')
+        errors = []
+
+        def writer(n):
+            for i in range(200):
+                try:
+                    write_json(path, {'writer': n, 'i': i})
+                except Exception as e:
+                    errors.append(e)
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(read_json(path)['i'], 199)
+        self.assertEqual(os.listdir(os.path.dirname(path)), ['state.json'])
+
+
+if __name__ == '__main__':
+    unittest.main()
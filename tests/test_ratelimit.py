@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+"""Tests for the token bucket rate limiter."""
+import time
+import unittest
+
+import kodi_stubs  # noqa: F401
+
+from lib.utils.ratelimit import TokenBucket
+
+
+class TokenBucketTest(unittest.TestCase):
+
+    def test_burst_then_rate(self):
+        bucket = TokenBucket(rate=20, burst=2)
+        start = time.monotonic()
+        for _ in range(2):
+            bucket.acquire()
+        self.assertLess(time.monotonic() - start, 0.02)
+        for _ in range(2):
+            bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+
+if __name__ == '__main__':
+    unittest.main()
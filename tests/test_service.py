@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""Tests for the background service: settings changes and playback reporting."""
+import os
+import time
+import unittest
+
+from kodi_stubs import PROFILE_DIR, SETTINGS, WINDOW_PROPERTIES
+
+import service
+from lib.services import jiotv
+from lib.utils.jsonfile import read_json
+
+
+class RevTVServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        SETTINGS.update(gateway_mode='server', gateway_key='secret', gateway_port='0',
+                        gateway_host='', jiotv_device_id='device')
+        self.addCleanup(SETTINGS.clear)
+        self.service = service.RevTVService()
+        self.service.configure_gateway()
+        self.addCleanup(self.service.stop_gateway)
+
+    def test_token_write_keeps_gateway_running(self):
+        gateway = self.service.gateway
+        SETTINGS['jiotv_token'] = 'refreshed'
+        self.service.onSettingsChanged()
+        self.assertIs(self.service.gateway, gateway)
+
+    def test_gateway_setting_restarts_gateway(self):
+        gateway = self.service.gateway
+        SETTINGS['gateway_key'] = 'rotated'
+        self.service.onSettingsChanged()
+        self.assertIsNot(self.service.gateway, gateway)
+        self.assertEqual(self.service.gateway.key, 'rotated')
+
+
+class PlaybackMonitorTest(unittest.TestCase):
+
+    def test_time_to_first_frame_is_recorded(self):
+        WINDOW_PROPERTIES[jiotv.PLAY_START_PROPERTY] = f"143:{time.time() - 1.5}"
+        service.PlaybackMonitor().onAVStarted()
+        self.assertNotIn(jiotv.PLAY_START_PROPERTY, WINDOW_PROPERTIES)
+        last = read_json(os.path.join(PROFILE_DIR, 'playback_stats.json'), default=[])[-1]
+        self.assertEqual(last['channel_id'], '143')
+        self.assertGreaterEqual(last['ttff'], 1.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
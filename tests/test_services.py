@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""Tests for the ServiceProvider base class: auth retry, rate limits, caching and hooks."""
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import kodi_stubs  # noqa: F401
+
+from lib.services.base import ServiceProvider
+
+
+class _Upstream(BaseHTTPRequestHandler):
+    """Answers GETs with 200 and a short body; /private needs the fresh token."""
+
+    def do_GET(self):
+        if self.path == '/private' and self.headers.get('Authorization') != 'Bearer fresh':
+            self.send_response(401)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, *args):
+        pass
+
+
+class ServiceProviderTest(unittest.TestCase):
+
+    def setUp(self):
+        upstream = ThreadingHTTPServer(('127.0.0.1', 0), _Upstream)
+        threading.Thread(target=upstream.serve_forever, daemon=True).start()
+        self.addCleanup(upstream.server_close)
+        self.addCleanup(upstream.shutdown)
+        self.host = f'127.0.0.1:{upstream.server_address[1]}'
+        self.url = f'http://{self.host}/'
+
+    def test_failing_metrics_hook_does_not_fail_request(self):
+        class Broken(ServiceProvider):
+            def on_response(self, url, response, elapsed):
+                raise OSError('disk full')
+
+        self.assertEqual(Broken().get(self.url).status_code, 200)
+
+    def test_401_refreshes_and_retries_once(self):
+        class Provider(ServiceProvider):
+            token = 'expired'
+            refreshes = 0
+
+            def auth_headers(self):
+                return {'Authorization': f'Bearer {self.token}'}
+
+            def refresh_auth(self):
+                self.refreshes += 1
+                self.token = 'fresh'
+                return True
+
+        provider = Provider()
+        self.assertEqual(provider.get(self.url + 'private').status_code, 200)
+        self.assertEqual(provider.refreshes, 1)
+
+        provider.token = 'revoked'
+        provider.refresh_auth = lambda: True  # Claims success but keeps a bad token
+        self.assertEqual(provider.get(self.url + 'private').status_code, 401)
+
+    def test_requests_are_rate_limited_per_host(self):
+        host = self.host
+
+        class Provider(ServiceProvider):
+            rate_limits = {host: (20, 1)}
+
+        provider = Provider()
+        start = time.monotonic()
+        for _ in range(3):
+            provider.get(self.url)
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+    def test_cached_keeps_values_until_invalidated(self):
+        provider = ServiceProvider()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            return ['value'] if len(calls) > 1 else []
+
+        self.assertEqual(provider.cached('key', 60, fetch), [])  # Empty results are not kept
+        self.assertEqual(provider.cached('key', 60, fetch), ['value'])
+        self.assertEqual(provider.cached('key', 60, fetch), ['value'])
+        self.assertEqual(len(calls), 2)
+        provider.invalidate('key')
+        provider.cached('key', 60, fetch)
+        self.assertEqual(len(calls), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()